@@ -0,0 +1,62 @@
+import json
+import logging
+from typing import Any, Optional
+
+from .config import settings
+
+try:
+    import redis
+except Exception:  # optional: without redis every lookup is a miss
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+# Default lifetime of cached reads; writes invalidate explicitly, this only
+# bounds staleness from writers that do not
+DEFAULT_TTL_SECONDS = 60
+
+_client = (
+    redis.Redis(host=settings.REDIS_HOST, port=settings.REDIS_PORT, decode_responses=True, socket_timeout=1)
+    if redis else None
+)
+
+
+def balance_key(account_number: str) -> str:
+    return f"bal:{account_number}"
+
+
+def amount_due_key(investor_id: str) -> str:
+    return f"due:{investor_id}"
+
+
+def get_json(key: str) -> Optional[Any]:
+    """Cached value for key, or None on a miss or when Redis is unavailable."""
+    if _client is None:
+        return None
+    try:
+        raw = _client.get(key)
+    except Exception as e:
+        logger.warning("Cache read failed for %s: %s", key, str(e))
+        return None
+    return json.loads(raw) if raw is not None else None
+
+
+def set_json(key: str, value: Any, ttl: int = DEFAULT_TTL_SECONDS) -> None:
+    """Store value under key for ttl seconds; best effort."""
+    if _client is None:
+        return
+    try:
+        _client.setex(key, ttl, json.dumps(value))
+    except Exception as e:
+        logger.warning("Cache write failed for %s: %s", key, str(e))
+
+
+def delete(*keys: str) -> None:
+    """Drop the given keys in one call; best effort."""
+    keys = [key for key in keys if key]
+    if _client is None or not keys:
+        return
+    try:
+        _client.delete(*keys)
+    except Exception as e:
+        logger.warning("Cache invalidation failed for %s: %s", keys, str(e))
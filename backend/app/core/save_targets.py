@@ -0,0 +1,23 @@
+import secrets
+import threading
+from typing import Dict, Optional
+
+# Paths picked in the desktop save dialog, keyed by a single-use upload token.
+# The dialog runs in the pywebview process and the bytes arrive over HTTP, so
+# the token is what ties the two together.
+_targets: Dict[str, str] = {}
+_lock = threading.Lock()
+
+
+def register(path: str) -> str:
+    """Remember path and return the token the upload must present."""
+    token = secrets.token_urlsafe(16)
+    with _lock:
+        _targets[token] = path
+    return token
+
+
+def claim(token: str) -> Optional[str]:
+    """Path registered under token, or None; each token works once."""
+    with _lock:
+        return _targets.pop(token, None)
@@ -1,5 +1,6 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from fastapi.responses import FileResponse
 import os
 import sys
@@ -59,6 +60,32 @@ app.include_router(api_v1)
 async def health_check():
     return {"status": "ok"}
 
+# Desktop PDF export: the pywebview save dialog registers the chosen path and
+# the page POSTs the raw PDF bytes here, so nothing is base64-encoded
+from app.core import save_targets
+
+@app.post("/save-pdf/{token}")
+async def save_pdf(token: str, request: Request):
+    save_path = save_targets.claim(token)
+    if not save_path:
+        raise HTTPException(status_code=404, detail="Unknown or expired save token")
+
+    # Write next to the target and rename into place once complete, so virus
+    # scanners and other readers never see a partial PDF
+    part_path = save_path + '.part'
+    f = await run_in_threadpool(open, part_path, 'wb')
+    try:
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(f.write, chunk)
+    except BaseException:
+        await run_in_threadpool(f.close)
+        await run_in_threadpool(os.remove, part_path)
+        raise
+    await run_in_threadpool(f.close)
+    await run_in_threadpool(os.replace, part_path, save_path)
+    return {"success": True, "path": save_path}
+
 # Scheduler Events
 from app.core.scheduler import start_scheduler, shutdown_scheduler
 
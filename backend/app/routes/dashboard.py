@@ -3,7 +3,7 @@ API routes for dashboard operations.
 """
 
 from fastapi import APIRouter, HTTPException, Header, Response
-from fastapi.responses import StreamingResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional
 from pydantic import BaseModel
 from ..services.dashboard import DashboardService
@@ -172,7 +172,7 @@ async def get_user_investments(authorization: Optional[str] = Header(None)):
 
 
 @router.get("/transactions")
-async def get_transaction_history(authorization: Optional[str] = Header(None), limit: int = 20):
+async def get_transaction_history(authorization: Optional[str] = Header(None), limit: int = 20, offset: int = 0):
     """
     Get transaction history for authenticated user.
     Requires session token in Authorization header.
@@ -206,13 +206,17 @@ async def get_transaction_history(authorization: Optional[str] = Header(None), l
         
         # Get transaction history
         transaction_service = TransactionService()
-        transactions_result = transaction_service.get_transaction_history(investor_id)
+        transactions_result = transaction_service.get_transaction_history(investor_id, limit=limit, offset=offset)
         
         if transactions_result['success']:
-            return {
+            response = {
                 'success': True,
-                'data': transactions_result['data'][:limit]  # Limit results
+                'data': transactions_result['data']
             }
+            if 'total' in transactions_result:
+                response['total'] = transactions_result['total']
+            # Rows are already JSON-native; skip the jsonable_encoder pass
+            return JSONResponse(content=response)
         else:
             return {
                 'success': False,
@@ -442,7 +446,7 @@ async def export_transaction_history(authorization: Optional[str] = Header(None)
         
         # Get all transactions
         tx_service = TransactionService()
-        tx_result = tx_service.get_transaction_history(investor_id)
+        tx_result = tx_service.get_transaction_history(investor_id, limit=None)
         
         if not tx_result['success']:
             raise HTTPException(status_code=500, detail="Failed to fetch transactions")
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
 from fastapi.responses import JSONResponse, RedirectResponse
 import logging
 from typing import Dict, Any
@@ -24,6 +24,18 @@ logger = logging.getLogger(__name__)
 # In-memory storage for pending investors (in production, use Redis or database)
 pending_investors = {}
 
+def _record_standalone_paystack_transaction(transaction_data: Dict[str, Any]):
+    """Write the audit row for a verified payment with no pending investor.
+    Runs as a background task after the response is sent; failures are only logged.
+    """
+    try:
+        transaction_service = TransactionService()
+        transaction_result = transaction_service.record_paystack_transaction(transaction_data)
+        if not transaction_result['success']:
+            logger.warning(f"Failed to record standalone paystack transaction: {transaction_result['error']}")
+    except Exception as e:
+        logger.warning(f"Error recording standalone paystack transaction: {str(e)}")
+
 @router.post("/initialize", response_model=PaymentResponse)
 async def initialize_payment(payment_request: PaymentInitRequest):
     """
@@ -88,7 +100,7 @@ async def initialize_payment(payment_request: PaymentInitRequest):
         raise HTTPException(status_code=500, detail=f"Failed to initialize payment: {str(e)}")
 
 @router.post("/verify", response_model=PaymentResponse)
-async def verify_payment(verify_request: PaymentVerifyRequest):
+async def verify_payment(verify_request: PaymentVerifyRequest, background_tasks: BackgroundTasks):
     """
     Verify a payment transaction and create investor record if successful
     """
@@ -157,14 +169,9 @@ async def verify_payment(verify_request: PaymentVerifyRequest):
                     data=transaction_data
                 )
         else:
-            # No investor data associated, record as a standalone paystack transaction
-            try:
-                transaction_service = TransactionService()
-                transaction_result = transaction_service.record_paystack_transaction(transaction_data)
-                if not transaction_result['success']:
-                    logger.warning(f"Failed to record standalone paystack transaction: {transaction_result['error']}")
-            except Exception as e:
-                logger.warning(f"Error recording standalone paystack transaction: {str(e)}")
+            # No investor data associated, record as a standalone paystack transaction.
+            # The response doesn't depend on the write, so do it after responding.
+            background_tasks.add_task(_record_standalone_paystack_transaction, transaction_data)
 
             return PaymentResponse(
                 status=True,
@@ -372,8 +372,8 @@ async def get_amount_due(
         if not user:
             raise HTTPException(status_code=401, detail="Invalid or expired session")
         
-        # Get user's investor ID
-        investor_response = dashboard_service.supabase.table('investors').select('id, portfolio_type, investment_type, initial_investment, created_at').eq('email', user['email']).execute()
+        # Get user's investor ID; weeks_elapsed since created_at is computed by the view
+        investor_response = dashboard_service.supabase.table('investor_weeks_elapsed').select('id, portfolio_type, investment_type, initial_investment, weeks_elapsed').eq('email', user['email']).execute()
         investor_data = getattr(investor_response, 'data', [])
         
         if not investor_data:
@@ -384,18 +384,7 @@ async def get_amount_due(
         portfolio_type = investor.get('portfolio_type')
         investment_type = investor.get('investment_type')
         initial_investment = float(investor.get('initial_investment', 0))
-        
-        # Calculate weeks elapsed since investment start
-        created_at = investor.get('created_at')
-        weeks_elapsed = 0
-        if created_at:
-            from datetime import datetime
-            if isinstance(created_at, str):
-                start_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            else:
-                start_date = created_at
-            
-            weeks_elapsed = (datetime.now(start_date.tzinfo) - start_date).days // 7
+        weeks_elapsed = investor.get('weeks_elapsed') or 0
         
         # Calculate amount due
         service = PortfolioService()
@@ -521,11 +521,11 @@ class AdminService:
             
             summary = []
             service = InterestCalculationService()
+            # Missed-payment counts for every investor in one RPC instead of one query each
+            plans = service.calculate_all_missed_payments()
             
             for investor in investors:
-                # We can calculate missed payments using the service
-                # Note: This might be N+1 queries if we are not careful, but acceptable for admin dashboard volume
-                result = service.calculate_missed_payments(investor['id'])
+                result = plans.get(investor['id'], {'success': False})
                 
                 if result['success'] and result.get('missed_payments', 0) > 0:
                     summary.append({
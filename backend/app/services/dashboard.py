@@ -5,13 +5,20 @@ Handles fetching user info, investment balance, and related data.
 
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
+from operator import itemgetter
+from ..core import cache
 from ..core.config import settings
 from .transaction_service import TransactionService
+from .portfolio_service import get_portfolio_service, get_investment_requirements
 from .interest_calculation_service import InterestCalculationService
 import logging
 
 logger = logging.getLogger(__name__)
 
+# (transaction_type, withdraw_status) of a full transactions row, in one call
+_TX_KIND = itemgetter('transaction_type', 'withdraw_status')
+_SENT_WITHDRAWAL = ('withdrawal', 'sent')
+
 try:
     from supabase import create_client
 except Exception:
@@ -88,20 +95,16 @@ class DashboardService:
             if not investor_id:
                 return 0.0
             
-            # Get all transactions for this investor with amount_due > 0 and withdrawal not requested
-            # Exclude end_investment and renew_investment transaction types
-            response = self.supabase.table('transactions') \
-                .select('amount_due') \
-                .eq('investor_id', investor_id) \
-                .gt('amount_due', 0) \
-                .eq('withdrawal_requested', False) \
-                .not_.in_('transaction_type', ['end_investment', 'renew_investment']) \
-                .execute()
+            cached = cache.get_json(cache.amount_due_key(investor_id))
+            if cached is not None:
+                return cached
 
-            transactions_data = getattr(response, 'data', [])
+            # Sum amount_due in the database (unwithdrawn transactions, excluding
+            # end_investment and renew_investment) and get back a single scalar
+            response = self.supabase.rpc('get_amount_due', {'p_investor_id': investor_id}).execute()
 
-            # Sum all amount_due values
-            total_due = sum(float(tx.get('amount_due', 0)) for tx in transactions_data)
+            total_due = float(getattr(response, 'data', None) or 0)
+            cache.set_json(cache.amount_due_key(investor_id), total_due)
 
             return total_due
         except Exception as e:
@@ -182,11 +185,10 @@ class DashboardService:
 
             # Get transaction history using TransactionService
             transaction_service = TransactionService()
-            transactions_result = transaction_service.get_transaction_history(investor_id)
+            transactions_result = transaction_service.get_transaction_history(investor_id, limit=limit)
             
             if transactions_result['success']:
-                # Return limited number of transactions
-                return transactions_result['data'][:limit]
+                return transactions_result['data']
             else:
                 return []
         except Exception as e:
@@ -244,14 +246,13 @@ class DashboardService:
         
         if investor_data:
             try:
-                from .portfolio_service import PortfolioService
-                portfolio_service = PortfolioService()
+                portfolio_service = get_portfolio_service()
                 portfolio_type = investor_data[0].get('portfolio_type', '')
                 investment_type = investor_data[0].get('investment_type', '')
                 available_investments = portfolio_service.get_available_investments(portfolio_type)
                 
                 # Get interest rate for the current investment
-                requirements = portfolio_service.get_investment_requirements(portfolio_type, investment_type)
+                requirements = get_investment_requirements(portfolio_type, investment_type)
                 if requirements:
                     interest_rate = requirements.get('weekly_interest_rate', 0)
             except Exception as e:
@@ -262,15 +263,13 @@ class DashboardService:
         analytics_summary = {}
         if investor_data:
             try:
-                from .portfolio_service import PortfolioService
-                portfolio_service = PortfolioService()
                 investor = investor_data[0]
                 portfolio_type = investor.get('portfolio_type')
                 investment_type = investor.get('investment_type')
                 initial_investment = float(investor.get('initial_investment', 0))
                 investment_start_date = investor.get('created_at')
 
-                requirements = portfolio_service.get_investment_requirements(portfolio_type, investment_type)
+                requirements = get_investment_requirements(portfolio_type, investment_type)
 
                 if requirements:
                     weekly_rate = requirements["weekly_interest_rate"] / 100
@@ -304,9 +303,8 @@ class DashboardService:
                     largest_withdrawal = 0
 
                     for transaction in all_transactions:
-                        if (transaction.get('transaction_type') == 'withdrawal' and
-                            transaction.get('withdraw_status') == 'sent'):
-                            amount = float(transaction.get('amount', 0))
+                        if _TX_KIND(transaction) == _SENT_WITHDRAWAL:
+                            amount = float(transaction['amount'] or 0)
                             total_withdrawn += amount
                             withdrawal_count += 1
                             largest_withdrawal = max(largest_withdrawal, amount)
@@ -330,8 +328,6 @@ class DashboardService:
         goals_data = {}
         if investor_data:
             try:
-                from .portfolio_service import PortfolioService
-                portfolio_service = PortfolioService()
                 investor = investor_data[0]
                 portfolio_type = investor.get('portfolio_type')
                 investment_type = investor.get('investment_type')
@@ -339,7 +335,7 @@ class DashboardService:
                 investment_start_date = investor.get('created_at')
 
                 # Get investment rules
-                requirements = portfolio_service.get_investment_requirements(portfolio_type, investment_type)
+                requirements = get_investment_requirements(portfolio_type, investment_type)
                 if requirements:
                     weekly_rate = requirements["weekly_interest_rate"] / 100
                     weekly_interest = initial_investment * weekly_rate
@@ -350,8 +346,7 @@ class DashboardService:
                     # Filter withdrawal transactions
                     withdrawals = []
                     for transaction in all_transactions:
-                        if (transaction.get('transaction_type') == 'withdrawal' and
-                            transaction.get('withdraw_status') == 'sent'):
+                        if _TX_KIND(transaction) == _SENT_WITHDRAWAL:
                             withdrawals.append({
                                 'id': transaction.get('id'),
                                 'amount': float(transaction.get('amount', 0)),
@@ -655,9 +650,7 @@ class DashboardService:
                     interest_service = InterestCalculationService()
 
                     # Get portfolio requirements to calculate expiry date
-                    from .portfolio_service import PortfolioService
-                    portfolio_service = PortfolioService()
-                    requirements = portfolio_service.get_investment_requirements(portfolio_type, investment_type)
+                    requirements = get_investment_requirements(portfolio_type, investment_type)
 
                     if requirements and requirements.get('expiry_weeks'):
                         # Calculate expiry date: start_date + duration_weeks
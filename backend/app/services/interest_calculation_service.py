@@ -4,13 +4,47 @@ Handles interest calculation based on investment start date, portfolio type, and
 """
 
 from typing import Dict, Any, Optional
-from datetime import datetime, timedelta, date
+from datetime import datetime, timedelta, date, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from ..core.config import settings
+from .portfolio_service import PortfolioService
 
 try:
     from supabase import create_client
+    from postgrest.types import ReturnMethod
 except Exception:
     create_client = None
+    ReturnMethod = None
+
+# Upper bound on investors processed concurrently by the due-date cron.
+# Keep below the Supabase connection limit.
+MAX_CONCURRENCY = 10
+
+# Investors fetched per page by the cron scan
+INVESTOR_PAGE_SIZE = 1000
+
+# Investor columns needed to reconcile and act on due dates
+_DUE_DATE_COLUMNS = 'last_due_date, next_due_date, investment_start_date, created_at, current_week, investment_expiry_date, portfolio_type, investment_type'
+
+
+def _to_dt(value: Any) -> Optional[datetime]:
+    """Parse a Supabase date/timestamp value (ISO string, date or datetime) into a datetime."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime.combine(value, datetime.min.time())
+    return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+
+
+def _to_utc(value: Any) -> Optional[datetime]:
+    """Parse like _to_dt and normalize to an aware UTC datetime (naive values are taken as UTC)."""
+    dt = _to_dt(value)
+    if dt is None:
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
 
 
 class InterestCalculationService:
@@ -24,22 +58,21 @@ class InterestCalculationService:
             raise RuntimeError("Supabase config missing in settings")
 
         self.supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+        self._portfolio_service = PortfolioService()
+        # (portfolio_type, investment_type) repeats across a cron run, so memoize the rate lookup
+        self._weekly_rate_for = lru_cache(maxsize=128)(self._lookup_weekly_rate)
 
-    def calculate_weekly_interest(self, portfolio_type: str, investment_type: str, balance: float) -> Optional[float]:
-        """Calculate weekly interest amount for an investment."""
-        # Import portfolio service to get investment rules
-        from .portfolio_service import PortfolioService
-        portfolio_service = PortfolioService()
-        
-        requirements = portfolio_service.get_investment_requirements(portfolio_type, investment_type)
-        
+    def _lookup_weekly_rate(self, portfolio_type: str, investment_type: str) -> Optional[float]:
+        """Weekly interest rate as a fraction, or None if the investment is unknown."""
+        requirements = self._portfolio_service.get_investment_requirements(portfolio_type, investment_type)
         if not requirements:
             return None
-        
-        # Calculate weekly interest amount
-        weekly_rate = requirements["weekly_interest_rate"] / 100
-        weekly_interest = balance * weekly_rate
-        return weekly_interest
+        return requirements["weekly_interest_rate"] / 100
+
+    def calculate_weekly_interest(self, portfolio_type: str, investment_type: str, balance: float) -> Optional[float]:
+        """Calculate weekly interest amount for an investment."""
+        weekly_rate = self._weekly_rate_for(portfolio_type, investment_type)
+        return None if weekly_rate is None else balance * weekly_rate
 
     def get_investor_spending_account(self, investor_id: str) -> Dict[str, Any]:
         """Get or create spending account for an investor."""
@@ -111,14 +144,9 @@ class InterestCalculationService:
                     'weeks_elapsed': 0
                 }
 
-            # Parse investment start date
-            if isinstance(investment_start_date, str):
-                start_date = datetime.fromisoformat(investment_start_date.replace('Z', '+00:00'))
-            else:
-                start_date = investment_start_date
-
             # Calculate weeks elapsed since investment start
-            weeks_elapsed = (datetime.now(start_date.tzinfo) - start_date).days // 7
+            start_date = _to_utc(investment_start_date)
+            weeks_elapsed = (datetime.now(timezone.utc) - start_date).days // 7
 
             # Calculate current week's interest using total investment amount (unified balance)
             weekly_interest = self.calculate_weekly_interest(portfolio_type, investment_type, total_investment)
@@ -144,36 +172,40 @@ class InterestCalculationService:
                 'error': f'Error calculating current interest: {str(e)}'
             }
 
+    def _plan_row_to_result(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        # weeks_elapsed is total full weeks passed.
+        # payment_counter is total payments made.
+        # missed = weeks_elapsed - payment_counter
+        # If Result < 0, it means overpayment (should alert)
+        return {
+            'success': True,
+            'weeks_elapsed': row['weeks_elapsed'],
+            'payment_counter': row['payment_counter'],
+            'missed_payments': row['missed_count'],
+            'next_due_date': row.get('next_due_date')
+        }
+
     def calculate_missed_payments(self, investor_id: str) -> Dict[str, Any]:
         """
         Calculate number of missed payments based on weeks elapsed vs payment counter.
+        The week arithmetic runs in the catch_up_plan database function.
         """
         try:
-            interest_result = self.calculate_current_interest(investor_id)
-            if not interest_result['success']:
-                return interest_result
-            
-            weeks_elapsed = interest_result['weeks_elapsed']
-            payment_counter = interest_result.get('payment_counter', 0)
-            
-            # weeks_elapsed is total full weeks passed.
-            # payment_counter is total payments made.
-            # Missed = weeks_elapsed - payment_counter
-            # If Result < 0, it means overpayment (should alert)
-            
-            missed_count = weeks_elapsed - payment_counter
+            response = self.supabase.rpc('catch_up_plan', {'p_investor_id': investor_id}).execute()
+            rows = getattr(response, 'data', []) or []
+            if not rows:
+                return {'success': False, 'error': 'Investor not found'}
             
-            return {
-                'success': True,
-                'weeks_elapsed': weeks_elapsed,
-                'payment_counter': payment_counter,
-                'missed_payments': missed_count,
-                'data': interest_result
-            }
+            return self._plan_row_to_result(rows[0])
             
         except Exception as e:
             return {'success': False, 'error': f"Error calculating missed payments: {str(e)}"}
 
+    def calculate_all_missed_payments(self) -> Dict[str, Dict[str, Any]]:
+        """calculate_missed_payments for every investor in one RPC, keyed by investor id."""
+        response = self.supabase.rpc('catch_up_plan', {'p_investor_id': None}).execute()
+        return {row['investor_id']: self._plan_row_to_result(row) for row in getattr(response, 'data', []) or []}
+
     def update_spending_account(self, investor_id: str, interest_amount: float) -> Dict[str, Any]:
         """Add interest to investor's spending account."""
         try:
@@ -189,218 +221,26 @@ class InterestCalculationService:
             # Update spending account balance
             update_data = {
                 'balance': new_balance,
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            update_response = self.supabase.table('spending_accounts').update(update_data).eq('id', account['id']).execute()
-            update_data_result = getattr(update_response, 'data', [])
-            
-            if update_data_result:
-                return {
-                    'success': True,
-                    'new_balance': new_balance,
-                    'interest_added': interest_amount
-                }
-            else:
-                return {
-                    'success': False,
-                    'error': 'Failed to update spending account'
-                }
-                
-        except Exception as e:
-            return {
-                'success': False,
-                'error': f'Error updating spending account: {str(e)}'
-            }
-
-    def _update_next_due_date(self, investor_id: str) -> bool:
-        """
-        Update the next_due_date to next week.
-        Logic:
-        - The payment was just made for 'next_due_date'.
-        - So 'last_due_date' becomes the old 'next_due_date'.
-        - New 'next_due_date' becomes old 'next_due_date' + 7 days.
-        """
-        try:
-            # Get investor data
-            investor_response = self.supabase.table('investors').select('next_due_date, current_week, investment_expiry_date, portfolio_type, investment_type, investment_start_date, created_at').eq('id', investor_id).execute()
-            investor_data = getattr(investor_response, 'data', [])
-
-            if not investor_data:
-                return False
-
-            investor = investor_data[0]
-            current_next_due_date = investor.get('next_due_date')
-            current_week = int(investor.get('current_week', 0))
-            investment_expiry_date = investor.get('investment_expiry_date')
-
-            if not current_next_due_date:
-                # Should not happen if we just paid, but handle gracefully
-                return False
-
-            # Parse current due date (which was just paid)
-            if isinstance(current_next_due_date, str):
-                just_paid_date_obj = datetime.fromisoformat(current_next_due_date.replace('Z', '+00:00'))
-            else:
-                just_paid_date_obj = current_next_due_date
-
-            # Calculate new dates
-            new_last_due_date_obj = just_paid_date_obj
-            new_next_due_date_obj = just_paid_date_obj + timedelta(days=7)
-            new_current_week = current_week + 1
-
-            # Calculate expiry date dynamically
-            portfolio_type = investor.get('portfolio_type')
-            investment_type = investor.get('investment_type')
-            start_date_val = investor.get('investment_start_date') or investor.get('created_at')
-            
-            if portfolio_type and investment_type and start_date_val:
-                from .portfolio_service import PortfolioService
-                portfolio_service = PortfolioService()
-                
-                if isinstance(start_date_val, str):
-                    start_date_obj = datetime.fromisoformat(start_date_val.replace('Z', '+00:00'))
-                else:
-                    start_date_obj = start_date_val
-                    
-                expiry_date_obj = portfolio_service.get_investment_expiry_date(portfolio_type, investment_type, start_date_obj)
-                
-                if expiry_date_obj:
-                     # Ensure both are timezone-aware or both naive for comparison
-                    if new_next_due_date_obj.tzinfo is not None and expiry_date_obj.tzinfo is None:
-                        expiry_date_obj = expiry_date_obj.replace(tzinfo=new_next_due_date_obj.tzinfo)
-                    elif new_next_due_date_obj.tzinfo is None and expiry_date_obj.tzinfo is not None:
-                        new_next_due_date_obj = new_next_due_date_obj.replace(tzinfo=expiry_date_obj.tzinfo)
-
-                     # If new next due date is past expiry, set to None
-                    if new_next_due_date_obj > expiry_date_obj:
-                        new_next_due_date_obj = None
-            
-            update_data = {
-                'last_due_date': new_last_due_date_obj.isoformat(),
-                'next_due_date': new_next_due_date_obj.isoformat() if new_next_due_date_obj else None,
-                'current_week': new_current_week,
-                'updated_at': datetime.now().isoformat()
+                'updated_at': datetime.now(timezone.utc).isoformat()
             }
             
-            # If finished
-            if new_next_due_date_obj is None:
-                # Removed investment_status update as column does not exist
-                pass
-
-            update_response = self.supabase.table('investors').update(update_data).eq('id', investor_id).execute()
-            update_data_result = getattr(update_response, 'data', [])
-
-            return bool(update_data_result)
-
-        except Exception as e:
-            print(f"Error updating next_due_date for investor {investor_id}: {str(e)}")
-            return False
-
-    def process_auto_withdrawal(self, investor_id: str) -> Dict[str, Any]:
-        """Process auto-withdrawal of interest to spending account on due date."""
-        try:
-            # 0. IDEMPOTENCY CHECK
-            # Check if we already paid interest today for this investor
-            today_start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
-            existing_tx = self.supabase.table('transactions')\
-                .select('id')\
-                .eq('investor_id', investor_id)\
-                .eq('transaction_type', 'interest_deposit')\
-                .gte('created_at', today_start)\
+            # Only success matters here, so skip echoing the row back.
+            # postgrest raises APIError on a non-2xx response.
+            self.supabase.table('spending_accounts')\
+                .update(update_data, returning=ReturnMethod.minimal)\
+                .eq('id', account['id'])\
                 .execute()
-            
-            if getattr(existing_tx, 'data', []):
-                 return {
-                    'success': True,
-                    'message': 'Interest already paid today',
-                    'paid': False # Important: indicate we didn't pay *now*, but it's done
-                }
 
-            # Calculate current interest
-            interest_result = self.calculate_current_interest(investor_id)
-            if not interest_result['success']:
-                return interest_result
-            
-            interest_amount = interest_result['interest_amount']
-            weeks_elapsed = interest_result['weeks_elapsed']
-            payment_counter = interest_result.get('payment_counter', 0)
-            
-            # CHECK: Only pay if we are due for the NEXT payment
-            # i.e., weeks_elapsed should be greater than payment_counter
-            # If weeks_elapsed == payment_counter, we are up to date.
-            if weeks_elapsed <= payment_counter:
-                 return {
-                    'success': True,
-                    'message': 'Payment not yet due based on counter',
-                    'paid': False,
-                    'debug': f"Weeks: {weeks_elapsed}, Counter: {payment_counter}"
-                }
-
-            if interest_amount <= 0:
-                return {
-                    'success': True,
-                    'message': 'No interest to withdraw'
-                }
-            
-            # Add interest to spending account
-            update_result = self.update_spending_account(investor_id, interest_amount)
-            if not update_result['success']:
-                return update_result
-            
-            # Update investor's total_paid
-            investor_response = self.supabase.table('investors').select('total_paid, email, account_number, portfolio_type, investment_type').eq('id', investor_id).execute()
-            investor_data = getattr(investor_response, 'data', [])
-            
-            if investor_data:
-                investor = investor_data[0]
-                current_total_paid = float(investor.get('total_paid', 0) or 0)
-                new_total_paid = current_total_paid + interest_amount
-                
-                new_total_paid = current_total_paid + interest_amount
-                
-                # Update investor record with new total_paid AND increment payment_counter
-                new_counter = payment_counter + 1
-                
-                investor_update_data = {
-                    'total_paid': new_total_paid,
-                    'payment_counter': new_counter,
-                    'updated_at': datetime.now().isoformat()
-                }
-                
-                self.supabase.table('investors').update(investor_update_data).eq('id', investor_id).execute()
-                
-                # Record transaction
-                import uuid
-                transaction_data = {
-                    'investor_id': investor_id,
-                    'amount': interest_amount,
-                    'transaction_type': 'interest_deposit',
-                    'transaction_id': f"INT-{uuid.uuid4().hex[:12].upper()}",
-                    'email': investor.get('email'),
-                    'account_number': investor.get('account_number'),
-                    'portfolio_type': investor.get('portfolio_type'),
-                    'investment_type': investor.get('investment_type'),
-                    'withdraw_status': 'completed',
-                    'created_at': datetime.now().isoformat()
-                }
-                
-                transaction_response = self.supabase.table('transactions').insert(transaction_data).execute()
-                transaction_data_result = getattr(transaction_response, 'data', [])
+            return {
+                'success': True,
+                'new_balance': new_balance,
+                'interest_added': interest_amount
+            }
                 
-                return {
-                    'success': True,
-                    'interest_deposited': interest_amount,
-                    'new_balance': update_result['new_balance'],
-                    'transaction_recorded': bool(transaction_data_result)
-                }
-            
-            return {'success': False, 'error': 'Investor not found for update'}
-            
         except Exception as e:
             return {
                 'success': False,
-                'error': f'Error processing auto-withdrawal: {str(e)}'
+                'error': f'Error updating spending account: {str(e)}'
             }
 
     def get_spending_account_balance(self, investor_id: str) -> Dict[str, Any]:
@@ -425,52 +265,29 @@ class InterestCalculationService:
             }
 
     def process_user_withdrawal(self, investor_id: str, withdrawal_amount: float) -> Dict[str, Any]:
-        """Process user withdrawal request from spending account."""
+        """Process user withdrawal request from spending account.
+        Balance check and deduction run atomically in the withdraw_from_spending database function.
+        """
         try:
-            # Check spending account balance
-            balance_result = self.get_spending_account_balance(investor_id)
-            if not balance_result['success']:
-                return balance_result
-            
-            current_balance = balance_result['balance']
-            
-            if withdrawal_amount > current_balance:
+            response = self.supabase.rpc('withdraw_from_spending', {
+                'p_investor_id': investor_id,
+                'p_amount': withdrawal_amount
+            }).execute()
+
+            result = getattr(response, 'data', None)
+            if not isinstance(result, dict):
                 return {
                     'success': False,
-                    'error': 'Insufficient balance in spending account'
+                    'error': 'Failed to update spending account'
                 }
-            
-            # Deduct amount from spending account
-            account_result = self.get_investor_spending_account(investor_id)
-            if not account_result['success']:
-                return account_result
-            
-            account = account_result['account']
-            new_balance = current_balance - withdrawal_amount
-            current_total_withdrawn = float(account.get('total_withdrawn', 0))
-            new_total_withdrawn = current_total_withdrawn + withdrawal_amount
-            
-            # Update spending account
-            update_data = {
-                'balance': new_balance,
-                'total_withdrawn': new_total_withdrawn,
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            update_response = self.supabase.table('spending_accounts').update(update_data).eq('id', account['id']).execute()
-            update_data_result = getattr(update_response, 'data', [])
-            
-            if not update_data_result:
+
+            if result.get('success'):
                 return {
-                    'success': False,
-                    'error': 'Failed to update spending account'
+                    'success': True,
+                    'withdrawn_amount': withdrawal_amount,
+                    'new_balance': float(result.get('new_balance', 0))
                 }
-            
-            return {
-                'success': True,
-                'withdrawn_amount': withdrawal_amount,
-                'new_balance': new_balance
-            }
+            return result
             
         except Exception as e:
             return {
@@ -488,7 +305,7 @@ class InterestCalculationService:
         try:
             # Get investor data
             investor_response = self.supabase.table('investors')\
-                .select('last_due_date, next_due_date, investment_start_date, created_at, current_week, investment_expiry_date, portfolio_type, investment_type')\
+                .select(_DUE_DATE_COLUMNS)\
                 .eq('id', investor_id)\
                 .execute()
             
@@ -496,8 +313,18 @@ class InterestCalculationService:
             if not investor_data:
                 return {'success': False, 'error': 'Investor not found'}
                 
-            investor = investor_data[0]
-            
+        except Exception as e:
+            print(f"Error ensuring due dates up to date: {e}")
+            return {'success': False, 'error': str(e)}
+
+        return self._reconcile_due_dates(investor_id, investor_data[0])
+
+    def _reconcile_due_dates(self, investor_id: str, investor: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply the ensure_due_dates_up_to_date logic to an already-fetched investor row
+        (needs the _DUE_DATE_COLUMNS fields). Persists and returns the updated row.
+        """
+        try:
             last_due_date = investor.get('last_due_date')
             next_due_date = investor.get('next_due_date')
             investment_start_date = investor.get('investment_start_date') or investor.get('created_at')
@@ -511,15 +338,12 @@ class InterestCalculationService:
                 return {'success': True, 'data': investor}
 
             # Parse start date
-            if isinstance(investment_start_date, str):
-                start_date = datetime.fromisoformat(investment_start_date.replace('Z', '+00:00'))
-            elif isinstance(investment_start_date, datetime):
-                start_date = investment_start_date
-            else:
+            start_date = _to_utc(investment_start_date)
+            if start_date is None:
                 # Fallback if no start date
                 return {'success': True, 'data': investor}
 
-            now = datetime.now(start_date.tzinfo)
+            now = datetime.now(timezone.utc)
             dates_updated = False
 
             # 1. Initialize if missing
@@ -531,16 +355,10 @@ class InterestCalculationService:
                 dates_updated = True
             else:
                 # Parse existing dates
-                if isinstance(last_due_date, str):
-                    last_due_date_obj = datetime.fromisoformat(last_due_date.replace('Z', '+00:00'))
-                else:
-                    last_due_date_obj = last_due_date
+                last_due_date_obj = _to_utc(last_due_date)
                     
                 if next_due_date:
-                    if isinstance(next_due_date, str):
-                        next_due_date_obj = datetime.fromisoformat(next_due_date.replace('Z', '+00:00'))
-                    else:
-                        next_due_date_obj = next_due_date
+                    next_due_date_obj = _to_utc(next_due_date)
                 else:
                     # If next_due_date is None, it might be completed or just missing
                     # If completed, we shouldn't be here usually, but let's check expiry
@@ -564,28 +382,23 @@ class InterestCalculationService:
             
             today_date = now.date()
             
-            while next_due_date_obj.date() < today_date and current_week < 52:
-                # It was due in the past. Skip it.
-                current_week += 1
-                last_due_date_obj = next_due_date_obj
-                next_due_date_obj = last_due_date_obj + timedelta(days=7)
-                dates_updated = True
+            if next_due_date_obj.date() < today_date:
+                # It was due in the past. Skip every missed week in one step:
+                # the smallest k with next_due + 7k >= today, capped at week 52.
+                days_overdue = (today_date - next_due_date_obj.date()).days
+                missed = max(0, min(-(-days_overdue // 7), 52 - current_week))
+                if missed:
+                    current_week += missed
+                    last_due_date_obj = next_due_date_obj + timedelta(days=7 * (missed - 1))
+                    next_due_date_obj = next_due_date_obj + timedelta(days=7 * missed)
+                    dates_updated = True
 
             # 3. Check expiry using PortfolioService
             # We already have portfolio_type, investment_type, and start_date (parsed as start_date)
             if portfolio_type and investment_type:
-                from .portfolio_service import PortfolioService
-                portfolio_service = PortfolioService()
-                expiry_date_obj = portfolio_service.get_investment_expiry_date(portfolio_type, investment_type, start_date)
+                expiry_date_obj = self._portfolio_service.get_investment_expiry_date(portfolio_type, investment_type, start_date)
                 
                 if expiry_date_obj:
-                    # Ensure both are timezone-aware or both naive for comparison
-                    # If one is aware and other is naive, make naive one aware (assume UTC if Z was stripped or missing)
-                    if next_due_date_obj.tzinfo is not None and expiry_date_obj.tzinfo is None:
-                        expiry_date_obj = expiry_date_obj.replace(tzinfo=next_due_date_obj.tzinfo)
-                    elif next_due_date_obj.tzinfo is None and expiry_date_obj.tzinfo is not None:
-                        next_due_date_obj = next_due_date_obj.replace(tzinfo=expiry_date_obj.tzinfo)
-                        
                     if next_due_date_obj > expiry_date_obj:
                         next_due_date_obj = None
                         dates_updated = True
@@ -596,7 +409,7 @@ class InterestCalculationService:
                     'last_due_date': last_due_date_obj.isoformat(),
                     'next_due_date': next_due_date_obj.isoformat() if next_due_date_obj else None,
                     'current_week': current_week,
-                    'updated_at': datetime.now().isoformat()
+                    'updated_at': datetime.now(timezone.utc).isoformat()
                 }
                 
                 self.supabase.table('investors').update(update_data).eq('id', investor_id).execute()
@@ -612,38 +425,82 @@ class InterestCalculationService:
             print(f"Error ensuring due dates up to date: {e}")
             return {'success': False, 'error': str(e)}
 
+    def pay_investor_interest(self, investor_id: str, investor: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Pay this week's interest via the pay_investor_interest database function.
+        The function locks the investor row and does the idempotency check,
+        spending account credit, due date advance and transaction insert atomically.
+        `investor` is the row returned by ensure_due_dates_up_to_date.
+        """
+        try:
+            portfolio_type = investor.get('portfolio_type')
+            investment_type = investor.get('investment_type')
+
+            weekly_rate = self._weekly_rate_for(portfolio_type, investment_type)
+            if weekly_rate is None:
+                return {'success': False, 'error': 'Failed to calculate weekly interest'}
+
+            expiry_date = None
+            start_date_val = investor.get('investment_start_date') or investor.get('created_at')
+            if start_date_val:
+                expiry_date_obj = self._portfolio_service.get_investment_expiry_date(portfolio_type, investment_type, _to_utc(start_date_val))
+                if expiry_date_obj:
+                    expiry_date = expiry_date_obj.date().isoformat()
+
+            response = self.supabase.rpc('pay_investor_interest', {
+                'p_investor_id': investor_id,
+                'p_weekly_rate': weekly_rate,
+                'p_expiry_date': expiry_date
+            }).execute()
+
+            result = getattr(response, 'data', None)
+            if not isinstance(result, dict):
+                return {'success': False, 'error': 'Unexpected response from pay_investor_interest'}
+            return result
+
+        except Exception as e:
+            return {'success': False, 'error': f'Error paying investor interest: {str(e)}'}
+
     def process_investor_due_date_check(self, investor_id: str) -> Dict[str, Any]:
         """
         Check if today is the due date for the investor and process payment if so.
         First ensures dates are up to date.
         """
+        # 1. Ensure dates are sane
+        ensure_result = self.ensure_due_dates_up_to_date(investor_id)
+        if not ensure_result['success']:
+            return ensure_result
+        return self._pay_if_due_today(investor_id, ensure_result['data'])
+
+    def process_investor_due_date_check_prefetched(self, investor: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Same as process_investor_due_date_check for a row already loaded by
+        iter_investor_state_pages, skipping the per-investor SELECT.
+        """
+        ensure_result = self._reconcile_due_dates(investor['id'], investor)
+        if not ensure_result['success']:
+            return ensure_result
+        return self._pay_if_due_today(investor['id'], ensure_result['data'])
+
+    def _pay_if_due_today(self, investor_id: str, investor: Dict[str, Any]) -> Dict[str, Any]:
+        """Pay interest if the (already reconciled) next_due_date is today."""
         try:
-            # 1. Ensure dates are sane
-            ensure_result = self.ensure_due_dates_up_to_date(investor_id)
-            if not ensure_result['success']:
-                return ensure_result
-            
-            investor = ensure_result['data']
             next_due_date = investor.get('next_due_date')
             
             if not next_due_date:
                 return {'success': True, 'message': 'No upcoming due date'}
 
             # 2. Check if due today
-            if isinstance(next_due_date, str):
-                due_date = datetime.fromisoformat(next_due_date.replace('Z', '+00:00')).date()
-            else:
-                due_date = next_due_date.date() if isinstance(next_due_date, datetime) else next_due_date
-            
-            today = date.today()
+            due_date = _to_utc(next_due_date).date()
+            today = datetime.now(timezone.utc).date()
             
             if due_date == today:
-                # Process payment
-                result = self.process_auto_withdrawal(investor_id)
+                # Process payment and advance to next week in one round trip
+                result = self.pay_investor_interest(investor_id, investor)
                 if result['success']:
-                    # Update to next week
-                    self._update_next_due_date(investor_id)
-                    return {'success': True, 'message': 'Interest paid', 'paid': True}
+                    if result.get('paid'):
+                        return {'success': True, 'message': 'Interest paid', 'paid': True}
+                    return {'success': True, 'message': result.get('message'), 'paid': False}
                 else:
                     return {'success': False, 'error': result.get('error')}
             
@@ -652,6 +509,31 @@ class InterestCalculationService:
         except Exception as e:
             return {'success': False, 'error': f"Error in due date check: {str(e)}"}
 
+    def _safe_due_date_check(self, investor: Dict[str, Any]) -> Dict[str, Any]:
+        """Run process_investor_due_date_check_prefetched, turning any exception into an error result."""
+        try:
+            return self.process_investor_due_date_check_prefetched(investor)
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def iter_investor_state_pages(self, page_size: int = INVESTOR_PAGE_SIZE):
+        """Yield the due-date state of every investor, one page of rows at a time.
+        Keyset pagination on id keeps each query cheap regardless of how deep the scan is.
+        """
+        last_id = None
+        while True:
+            query = self.supabase.table('investors').select(f'id, {_DUE_DATE_COLUMNS}')
+            if last_id is not None:
+                query = query.gt('id', last_id)
+            response = query.order('id').limit(page_size).execute()
+            rows = getattr(response, 'data', []) or []
+            if not rows:
+                return
+            yield rows
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]['id']
+
     def check_and_process_all_due_dates(self) -> Dict[str, Any]:
         """
         Iterate over all active investors and process their due dates.
@@ -663,22 +545,32 @@ class InterestCalculationService:
             # Removing filter on 'investment_status' as it doesn't exist.
             # We can filter by 'status' != 'completed' if 'status' is the column.
             # But let's just fetch all for now to be safe and avoid column errors.
-            response = self.supabase.table('investors').select('id').execute()
-            investors = getattr(response, 'data', [])
-            
             processed_count = 0
             errors = []
             
-            for investor in investors:
-                try:
-                    result = self.process_investor_due_date_check(investor['id'])
-                    if result['success']:
-                        if result.get('paid'):
-                            processed_count += 1
-                    else:
-                        errors.append(f"Investor {investor['id']}: {result.get('error')}")
-                except Exception as e:
-                    errors.append(f"Investor {investor['id']}: {str(e)}")
+            # Each check is a handful of blocking Supabase round trips, so run
+            # investors concurrently on a thread pool sharing this client.
+            # Investor state is read page by page (one SELECT per page instead of
+            # one per investor), and each page is drained before the next is
+            # fetched so only one page of rows and futures is held at a time.
+            with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
+                for page in self.iter_investor_state_pages():
+                    futures = {
+                        executor.submit(self._safe_due_date_check, row): row['id']
+                        for row in page
+                    }
+                    
+                    # Record results as they finish rather than in submission order,
+                    # surfacing each failure immediately instead of only in the final summary
+                    for future in as_completed(futures):
+                        result = future.result()
+                        if result['success']:
+                            if result.get('paid'):
+                                processed_count += 1
+                        else:
+                            error = f"Investor {futures[future]}: {result.get('error')}"
+                            print(f"Due date check failed: {error}")
+                            errors.append(error)
             
             return {
                 'success': True,
@@ -691,56 +583,41 @@ class InterestCalculationService:
                 'success': False,
                 'error': f"Error in batch processing: {str(e)}"
             }
-            return {
-                'success': False,
-                'error': f"Error in batch processing: {str(e)}"
-            }
 
     def admin_catch_up_missed_payments(self, investor_id: str) -> Dict[str, Any]:
         """
         Manually process all missed payments for an investor.
-        This loops and pays until payment_counter catches up to weeks_elapsed.
+        The catch_up_investor database function records one interest_deposit per missed
+        week, credits the spending account and brings payment_counter up to weeks_elapsed
+        in a single transaction. Weeks already recorded are skipped, so it is safe to retry.
         """
         try:
-            # 1. Calculate missed
-            missed_result = self.calculate_missed_payments(investor_id)
-            if not missed_result['success']:
-                return missed_result
-            
-            missed_count = missed_result['missed_payments']
+            investor_response = self.supabase.table('investors').select('portfolio_type, investment_type').eq('id', investor_id).execute()
+            investor_data = getattr(investor_response, 'data', [])
+            if not investor_data:
+                return {'success': False, 'error': 'Investor not found'}
+            investor = investor_data[0]
             
-            if missed_count <= 0:
-                return {'success': True, 'message': 'No missed payments to catch up', 'processed_count': 0}
+            weekly_rate = self._weekly_rate_for(investor.get('portfolio_type'), investor.get('investment_type'))
+            if weekly_rate is None:
+                return {'success': False, 'error': 'Failed to calculate weekly interest'}
             
-            processed_count = 0
-            errors = []
+            response = self.supabase.rpc('catch_up_investor', {
+                'p_investor_id': investor_id,
+                'p_weekly_rate': weekly_rate
+            }).execute()
             
-            # 2. Loop and pay
-            # We process one by one to ensure transaction logging and safety
-            for _ in range(missed_count):
-                # We call process_auto_withdrawal which now checks the counter
-                # It will pay one installment and increment counter
-                result = self.process_auto_withdrawal(investor_id)
-                
-                if result['success'] and result.get('transaction_recorded'):
-                    processed_count += 1
-                elif result['success'] and not result.get('paid'):
-                    # This happens if process_auto_withdrawal decides it shouldn't pay (limit reached?)
-                    # Should update missed logic if this happens
-                    break 
-                else:
-                    errors.append(result.get('error', 'Unknown error'))
-                    break # Stop on error
+            result = getattr(response, 'data', None)
+            if not isinstance(result, dict):
+                return {'success': False, 'error': 'Unexpected response from catch_up_investor'}
+            if not result.get('success'):
+                return result
             
-            # 3. Update due dates to reflect current reality
+            # Update due dates to reflect current reality
             self.ensure_due_dates_up_to_date(investor_id)
             
-            return {
-                'success': True,
-                'message': f"Processed {processed_count} missed payments",
-                'processed_count': processed_count,
-                'errors': errors
-            }
+            result['errors'] = []
+            return result
             
         except Exception as e:
             return {'success': False, 'error': f"Error in administrative catch-up: {str(e)}"}
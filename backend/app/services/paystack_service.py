@@ -1,7 +1,17 @@
-from pypaystack2 import PaystackClient
-from typing import Optional, Dict, Any
+from pypaystack2 import PaystackClient, AsyncPaystackClient
+from pypaystack2.exceptions import ClientNetworkError
+from pypaystack2.models import TransferInstruction
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
+from ..core import cache
 from ..core.config import settings
+import asyncio
+import httpx
 import logging
+import operator
+import random
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -25,9 +35,227 @@ BANK_CODE_MAP = {
     "Palm Pay": "999991",  # PalmPay
     "Union Bank": "032",
 }
+# Case-insensitive view of BANK_CODE_MAP, built once at import
+_BANK_CODE_MAP_LOWER = {name.lower(): code for name, code in BANK_CODE_MAP.items()}
+
+# Paystack's bank list changes on the order of months; refetch at most hourly.
+BANK_LIST_TTL_SECONDS = 3600
+# Redis key for the {lowercase bank name: code} JSON, shared by every worker process
+BANK_LIST_CACHE_KEY = "paystack:banks:nigeria:json"
+
+# pypaystack2 sends each request through module-level httpx.get/post, which opens
+# a fresh TCP+TLS connection per call. All Paystack traffic goes through this
+# shared keep-alive pool instead (see _use_pooled_session).
+PAYSTACK_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=50)
+PAYSTACK_HTTP_TIMEOUT = 10.0
+
+# Upper bound on concurrent Paystack calls from a single bulk operation
+PAYSTACK_BULK_CONCURRENCY = 10
+# Paystack's /transfer/bulk accepts at most this many transfers per request
+PAYSTACK_BULK_TRANSFER_LIMIT = 100
+
+# Transient failures (transport errors, 429, 5xx) are retried with exponential
+# backoff plus jitter: ~0.2s, ~0.4s, capped at 2s.
+PAYSTACK_MAX_ATTEMPTS = 3
+PAYSTACK_BACKOFF_INITIAL = 0.2
+PAYSTACK_BACKOFF_MAX = 2.0
+
+# After this many consecutive failures a sub-client fails fast for the reset window
+PAYSTACK_BREAKER_FAIL_MAX = 10
+PAYSTACK_BREAKER_RESET_SECONDS = 30
+
+
+# Fields read from Paystack payloads; everything else in the response is ignored
+TRANSACTION_FIELDS = ('id', 'reference', 'amount', 'currency', 'status', 'channel', 'paid_at', 'created_at', 'customer')
+
+
+@dataclass(slots=True)
+class PaystackResult:
+    """
+    Outcome of a PaystackService call. Supports the dict-style reads callers already
+    use (result['status'], result.get('data')); use as_dict() where a real dict is needed.
+    """
+    status: bool
+    message: Optional[str] = None
+    data: Any = None
+    errors: Optional[List[str]] = None
+    # True when the request may have reached Paystack but no reply was read,
+    # so whether it took effect is not known
+    outcome_unknown: bool = False
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def as_dict(self) -> Dict[str, Any]:
+        result = {"status": self.status, "message": self.message, "data": self.data}
+        if self.errors is not None:
+            result["errors"] = self.errors
+        return result
+
+
+def _pick(data: Any, keys: tuple) -> Dict[str, Any]:
+    """Extract only the named fields from a Paystack payload (pydantic model or dict)."""
+    if data is None:
+        return {key: None for key in keys}
+    if isinstance(data, dict):
+        return {key: data.get(key) for key in keys}
+    return {key: getattr(data, key, None) for key in keys}
+
+
+class PaystackUnavailableError(ClientNetworkError):
+    """Raised without contacting Paystack while an endpoint's circuit breaker is open."""
+
+
+class _CircuitBreaker:
+    """Consecutive-failure circuit breaker for one group of Paystack endpoints."""
+
+    def __init__(self, name: str, fail_max: int = PAYSTACK_BREAKER_FAIL_MAX,
+                 reset_timeout: float = PAYSTACK_BREAKER_RESET_SECONDS):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        # Start of the half-open trial call, while one is in flight
+        self._trial_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def before_call(self) -> bool:
+        """
+        Admit or reject a call. Returns True when the caller is the half-open trial,
+        which must be passed back to record().
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return False
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                raise PaystackUnavailableError(f"Paystack {self.name} is unavailable; circuit open")
+            # Half-open: admit a single trial call and reject the rest until it is
+            # recorded. A trial that never reports back stops blocking after the reset window.
+            if self._trial_started_at is not None and now - self._trial_started_at < self.reset_timeout:
+                raise PaystackUnavailableError(f"Paystack {self.name} is unavailable; circuit half-open")
+            self._trial_started_at = now
+            return True
+
+    def record(self, succeeded: bool, trial: bool = False) -> None:
+        with self._lock:
+            if trial:
+                self._trial_started_at = None
+                if succeeded:
+                    logger.info("Paystack %s circuit closed", self.name)
+                    self._opened_at = None
+                    self._failures = 0
+                else:
+                    self._opened_at = time.monotonic()
+                return
+            if succeeded:
+                self._failures = 0
+                return
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                if self._opened_at is None:
+                    logger.warning("Paystack %s circuit opened after %d failures", self.name, self._failures)
+                self._opened_at = time.monotonic()
+
+
+def _backoff_delay(attempt: int) -> float:
+    return min(PAYSTACK_BACKOFF_MAX, PAYSTACK_BACKOFF_INITIAL * 2 ** attempt) + random.uniform(0, PAYSTACK_BACKOFF_INITIAL)
+
+
+def _should_retry(attempt: int, method: Any, url: str, data: Any, error: Optional[Exception] = None,
+                  response: Optional[httpx.Response] = None) -> bool:
+    """
+    Decide whether a failed attempt is retried. Only requests that cannot be applied twice
+    are retried after they may have reached Paystack: GETs, and transfer POSTs carrying a
+    reference (Paystack dedupes transfers on it). Other POSTs such as transaction/initialize
+    reject a repeated reference, so a retry would turn a success into a failure.
+    Connect failures and 429s never reached Paystack, so always retry.
+    """
+    if attempt >= PAYSTACK_MAX_ATTEMPTS - 1:
+        return False
+    if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+        return True
+    if response is not None:
+        if response.status_code == 429:
+            return True
+        if response.status_code < 500:
+            return False
+    if method.value == "GET":
+        return True
+    return _is_transfer_url(url) and isinstance(data, dict) and bool(data.get('reference'))
+
+
+def _is_transfer_url(url: str) -> bool:
+    return httpx.URL(str(url)).path.rstrip('/') == '/transfer'
+
+
+def _use_pooled_session(api_client: Any, session: httpx.Client, breaker: _CircuitBreaker) -> None:
+    """
+    Route a pypaystack2 sub-client's requests through a shared httpx session.
+    Mirrors BaseAPIClient._handle_request, swapping the one-shot httpx calls for session.request,
+    with retries on transient failures behind the endpoint's circuit breaker.
+    """
+    def _handle_request(method, url, data=None, response_data_model_class=None, raise_serialization_exception=False):
+        request_kwargs = api_client._serialize_request_kwargs(url=url, method=method, data=data)
+        attempt = 0
+        while True:
+            trial = breaker.before_call()
+            try:
+                response = session.request(method.value, **request_kwargs)
+            except httpx.TransportError as error:
+                breaker.record(False, trial)
+                if not _should_retry(attempt, method, url, data, error=error):
+                    raise ClientNetworkError(f"network error occurred: {error}", error)
+            else:
+                breaker.record(response.status_code < 500, trial)
+                if not _should_retry(attempt, method, url, data, response=response):
+                    return api_client._deserialize_response(
+                        response, response_data_model_class, raise_serialization_exception
+                    )
+            time.sleep(_backoff_delay(attempt))
+            attempt += 1
+
+    api_client._handle_request = _handle_request
+
+
+def _use_pooled_async_session(api_client: Any, session: httpx.AsyncClient, breaker: _CircuitBreaker) -> None:
+    """
+    Async counterpart of _use_pooled_session for pypaystack2's Async* sub-clients.
+    """
+    async def _handle_request(method, url, data=None, response_data_model_class=None, raise_serialization_exception=False):
+        request_kwargs = api_client._serialize_request_kwargs(url=url, method=method, data=data)
+        attempt = 0
+        while True:
+            trial = breaker.before_call()
+            try:
+                response = await session.request(method.value, **request_kwargs)
+            except httpx.TransportError as error:
+                breaker.record(False, trial)
+                if not _should_retry(attempt, method, url, data, error=error):
+                    raise ClientNetworkError(f"network error occurred: {error}", error)
+            else:
+                breaker.record(response.status_code < 500, trial)
+                if not _should_retry(attempt, method, url, data, response=response):
+                    return api_client._deserialize_response(
+                        response, response_data_model_class, raise_serialization_exception
+                    )
+            await asyncio.sleep(_backoff_delay(attempt))
+            attempt += 1
+
+    api_client._handle_request = _handle_request
 
 
 class PaystackService:
+    # Pulls status/message/data off a pypaystack2 Response in one C-level call
+    _get_smd = staticmethod(operator.attrgetter('status', 'message', 'data'))
+
     def __init__(self):
         if not settings.PAYSTACK_SECRET_KEY:
             raise ValueError("PAYSTACK_SECRET_KEY is not set in environment variables. Please check your .env file.")
@@ -42,25 +270,47 @@ class PaystackService:
         self.verification = self.client.verification
         self.misc = self.client.miscellaneous
 
+        # One keep-alive connection pool shared by every sub-client above
+        self.http = httpx.Client(
+            http2=True,
+            limits=PAYSTACK_HTTP_LIMITS,
+            timeout=PAYSTACK_HTTP_TIMEOUT,
+        )
+        # One circuit breaker per endpoint group, shared by the sync and async clients
+        self._breakers = {
+            name: _CircuitBreaker(name)
+            for name in ('transactions', 'customers', 'transfer_recipients', 'transfers', 'verification', 'miscellaneous')
+        }
+        for name, breaker in self._breakers.items():
+            _use_pooled_session(getattr(self.client, name), self.http, breaker)
+
+        # Async client for overlapping independent calls (a_* methods, initiate_transfers_bulk)
+        self.async_client = AsyncPaystackClient(secret_key=settings.PAYSTACK_SECRET_KEY)
+        self.async_http = httpx.AsyncClient(
+            http2=True,
+            limits=PAYSTACK_HTTP_LIMITS,
+            timeout=PAYSTACK_HTTP_TIMEOUT,
+        )
+        for name in ('transfer_recipients', 'transfers'):
+            _use_pooled_async_session(getattr(self.async_client, name), self.async_http, self._breakers[name])
+
+        # Cached Paystack bank list as {lowercase name: code}, see _get_bank_index
+        self._bank_index: Optional[Dict[str, str]] = None
+        self._bank_index_expires_at = 0.0
+
     def _normalize_response(self, resp: Any) -> Dict[str, Any]:
         """Normalize pypaystack2 Response objects or dicts into a simple dict.
 
         Returns a dict with at least 'status', 'message', and 'data' keys.
+        'data' is passed through untouched (model or dict); read it with _pick.
         """
         try:
             # pypaystack2 returns a pydantic Response model with attributes
-            if hasattr(resp, 'status'):
-                status = getattr(resp, 'status')
-                message = getattr(resp, 'message', None)
-                data = getattr(resp, 'data', None)
-                # If data is a pydantic model, convert to dict
-                if hasattr(data, 'dict'):
-                    try:
-                        data = data.dict()
-                    except Exception:
-                        # leave as-is if conversion fails
-                        pass
-                return {"status": status, "message": message, "data": data}
+            status, message, data = self._get_smd(resp)
+            return {"status": status, "message": message, "data": data}
+        except AttributeError:
+            pass
+        try:
             # If it's already a dict-like response
             if isinstance(resp, dict):
                 return resp
@@ -69,7 +319,7 @@ class PaystackService:
         except Exception:
             return {"status": False, "message": "Unknown response from Paystack client", "data": None}
 
-    def verify_account_details(self, account_number: str, bank_code: str) -> Dict[str, Any]:
+    def verify_account_details(self, account_number: str, bank_code: str) -> PaystackResult:
         """
         Verify account details using Paystack
         """
@@ -81,12 +331,16 @@ class PaystackService:
             norm = self._normalize_response(response)
             
             if norm.get('status'):
-                return {"status": True, "message": "Account verified", "data": norm.get('data')}
+                return PaystackResult(
+                    status=True,
+                    message="Account verified",
+                    data=_pick(norm.get('data'), ('account_number', 'account_name', 'bank_id'))
+                )
             else:
-                return {"status": False, "message": norm.get('message', "Failed to verify account")}
+                return PaystackResult(status=False, message=norm.get('message', "Failed to verify account"))
         except Exception as e:
             logger.exception("Error verifying account: %s", str(e))
-            return {"status": False, "message": f"Error verifying account: {str(e)}"}
+            return PaystackResult(status=False, message=f"Error verifying account: {str(e)}")
 
     def initialize_transaction(
         self,
@@ -95,7 +349,7 @@ class PaystackService:
         metadata: Optional[Dict[str, Any]] = None,
         callback_url: Optional[str] = None,
         reference: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> PaystackResult:
         """
         Initialize a Paystack transaction
 
@@ -118,28 +372,22 @@ class PaystackService:
             norm = self._normalize_response(response)
 
             if norm.get('status'):
-                data = norm.get('data') or {}
-                # data may be a dict or pydantic model converted earlier
-                return {
-                    "status": True,
-                    "message": norm.get('message') or "Transaction initialized successfully",
-                    "data": {
-                        "authorization_url": data.get('authorization_url') if isinstance(data, dict) else getattr(data, 'authorization_url', None),
-                        "access_code": data.get('access_code') if isinstance(data, dict) else getattr(data, 'access_code', None),
-                        "reference": data.get('reference') if isinstance(data, dict) else getattr(data, 'reference', None),
-                    }
-                }
+                return PaystackResult(
+                    status=True,
+                    message=norm.get('message') or "Transaction initialized successfully",
+                    data=_pick(norm.get('data'), ('authorization_url', 'access_code', 'reference'))
+                )
             else:
                 logger.error("Paystack initialization failed: %s", norm.get('message'))
-                return {"status": False, "message": norm.get('message', 'Failed to initialize transaction')}
+                return PaystackResult(status=False, message=norm.get('message', 'Failed to initialize transaction'))
         except Exception as e:
             logger.exception("Error initializing transaction: %s", str(e))
-            return {
-                "status": False,
-                "message": f"Error initializing transaction: {str(e)}"
-            }
+            return PaystackResult(
+                status=False,
+                message=f"Error initializing transaction: {str(e)}"
+            )
 
-    def verify_transaction(self, reference: str) -> Dict[str, Any]:
+    def verify_transaction(self, reference: str) -> PaystackResult:
         """
         Verify a Paystack transaction
 
@@ -151,33 +399,24 @@ class PaystackService:
             norm = self._normalize_response(response)
 
             if norm.get('status'):
-                data = norm.get('data') or {}
-                # data could be a dict or model
-                def _get(d, k):
-                    return d.get(k) if isinstance(d, dict) else getattr(d, k, None)
-
-                return {
-                    "status": True,
-                    "message": norm.get('message') or "Transaction verified successfully",
-                    "data": {
-                        "reference": _get(data, 'reference'),
-                        "amount": _get(data, 'amount'),
-                        "status": _get(data, 'status'),
-                        "paid_at": _get(data, 'paid_at'),
-                        "customer": _get(data, 'customer'),
-                        "metadata": _get(data, 'metadata')
-                    }
-                }
+                data = _pick(norm.get('data'), ('reference', 'amount', 'status', 'paid_at', 'customer', 'metadata'))
+                # Callers read customer['email'], so flatten the nested model as well
+                data['customer'] = _pick(data['customer'], ('id', 'email', 'customer_code', 'first_name', 'last_name'))
+                return PaystackResult(
+                    status=True,
+                    message=norm.get('message') or "Transaction verified successfully",
+                    data=data
+                )
             else:
-                return {"status": False, "message": norm.get('message', 'Failed to verify transaction')}
+                return PaystackResult(status=False, message=norm.get('message', 'Failed to verify transaction'))
         except Exception as e:
             logger.exception("Error verifying transaction: %s", str(e))
-            return {
-                "status": False,
-                "message": f"Error verifying transaction: {str(e)}"
-            }
+            return PaystackResult(
+                status=False,
+                message=f"Error verifying transaction: {str(e)}"
+            )
 
-    def create_customer(self, email: str, first_name: str, last_name: str, phone: Optional[str] = None) -> Dict[str, Any]:
+    def create_customer(self, email: str, first_name: str, last_name: str, phone: Optional[str] = None) -> PaystackResult:
         """
         Create a Paystack customer
         """
@@ -191,17 +430,21 @@ class PaystackService:
             norm = self._normalize_response(response)
 
             if norm.get('status'):
-                return {"status": True, "message": norm.get('message') or "Customer created successfully", "data": norm.get('data')}
+                return PaystackResult(
+                    status=True,
+                    message=norm.get('message') or "Customer created successfully",
+                    data=_pick(norm.get('data'), ('id', 'customer_code', 'email', 'first_name', 'last_name'))
+                )
             else:
-                return {"status": False, "message": norm.get('message', 'Failed to create customer')}
+                return PaystackResult(status=False, message=norm.get('message', 'Failed to create customer'))
         except Exception as e:
             logger.exception("Error creating customer: %s", str(e))
-            return {
-                "status": False,
-                "message": f"Error creating customer: {str(e)}"
-            }
+            return PaystackResult(
+                status=False,
+                message=f"Error creating customer: {str(e)}"
+            )
 
-    def list_transactions(self, page: int = 1, per_page: int = 50) -> Dict[str, Any]:
+    def list_transactions(self, page: int = 1, per_page: int = 50) -> PaystackResult:
         """
         List all transactions
         """
@@ -210,18 +453,54 @@ class PaystackService:
             norm = self._normalize_response(response)
 
             if norm.get('status'):
-                return {"status": True, "message": norm.get('message') or "Transactions retrieved successfully", "data": norm.get('data')}
+                return PaystackResult(
+                    status=True,
+                    message=norm.get('message') or "Transactions retrieved successfully",
+                    data=[_pick(tx, TRANSACTION_FIELDS) for tx in norm.get('data') or []]
+                )
             else:
-                return {"status": False, "message": norm.get('message', 'Failed to retrieve transactions')}
+                return PaystackResult(status=False, message=norm.get('message', 'Failed to retrieve transactions'))
         except Exception as e:
             logger.exception("Error retrieving transactions: %s", str(e))
-            return {
-                "status": False,
-                "message": f"Error retrieving transactions: {str(e)}"
-            }
+            return PaystackResult(
+                status=False,
+                message=f"Error retrieving transactions: {str(e)}"
+            )
 
     # --- Payout / Transfer Methods ---
 
+    def _get_bank_index(self) -> Optional[Dict[str, str]]:
+        """
+        Return Paystack's Nigerian bank list as {lowercase name: code}.
+        Looks in this process first, then the shared Redis cache, and only then calls
+        Paystack. Each copy is reused for BANK_LIST_TTL_SECONDS; failures are not cached.
+        """
+        now = time.monotonic()
+        if self._bank_index is not None and now < self._bank_index_expires_at:
+            return self._bank_index
+
+        bank_index = cache.get_json(BANK_LIST_CACHE_KEY)
+        if bank_index is None:
+            response = self.misc.list_banks(country="nigeria")
+            norm = self._normalize_response(response)
+
+            if not norm.get('status'):
+                logger.error("Failed to list banks for resolution: %s", norm.get('message'))
+                return None
+
+            banks = norm.get('data') or []
+            bank_index = {}
+            for bank in banks:
+                fields = _pick(bank, ('name', 'code'))
+                if fields['code']:
+                    bank_index[(fields['name'] or '').lower()] = fields['code']
+            if bank_index:
+                cache.set_json(BANK_LIST_CACHE_KEY, bank_index, ttl=BANK_LIST_TTL_SECONDS)
+
+        self._bank_index = bank_index
+        self._bank_index_expires_at = now + BANK_LIST_TTL_SECONDS
+        return self._bank_index
+
     def resolve_bank_code(self, bank_name: str) -> Optional[str]:
         """
         Resolve bank name to bank code.
@@ -232,37 +511,24 @@ class PaystackService:
             return BANK_CODE_MAP[bank_name]
             
         # 2. Try case-insensitive match in static map
-        for name, code in BANK_CODE_MAP.items():
-            if name.lower() == bank_name.lower():
-                return code
+        code = _BANK_CODE_MAP_LOWER.get(bank_name.lower())
+        if code:
+            return code
 
-        # 3. Fallback to Paystack API lookup
+        # 3. Fallback to Paystack bank list (cached, names already lowercased)
         try:
-            response = self.misc.list_banks(country="nigeria")
-            norm = self._normalize_response(response)
-            
-            if not norm.get('status'):
-                logger.error("Failed to list banks for resolution: %s", norm.get('message'))
-                return None
-                
-            banks = norm.get('data') or []
-            if not banks:
+            bank_index = self._get_bank_index()
+            if not bank_index:
                 return None
                 
             # Normalize bank name for comparison
             target_name = bank_name.lower().strip()
             
-            # Try exact match first
-            for bank in banks:
-                if bank.get('name', '').lower() == target_name:
-                    return bank.get('code')
-            
-            # Try fuzzy match (contains)
-            for bank in banks:
-                if target_name in bank.get('name', '').lower() or bank.get('name', '').lower() in target_name:
-                    return bank.get('code')
-                    
-            return None
+            # Exact match via dict lookup, else a single fuzzy (contains) pass
+            return bank_index.get(target_name) or next(
+                (code for name, code in bank_index.items() if target_name in name or name in target_name),
+                None
+            )
             
         except Exception as e:
             logger.exception("Error resolving bank code: %s", str(e))
@@ -274,7 +540,7 @@ class PaystackService:
         account_number: str, 
         bank_code: str, 
         currency: str = "NGN"
-    ) -> Dict[str, Any]:
+    ) -> PaystackResult:
         """
         Create a Transfer Recipient
         """
@@ -290,13 +556,13 @@ class PaystackService:
             norm = self._normalize_response(response)
             
             if norm.get('status'):
-                return {"status": True, "message": "Recipient created", "data": norm.get('data')}
+                return PaystackResult(status=True, message="Recipient created", data=_pick(norm.get('data'), ('recipient_code', 'name')))
             else:
-                return {"status": False, "message": norm.get('message', "Failed to create recipient")}
+                return PaystackResult(status=False, message=norm.get('message', "Failed to create recipient"))
                 
         except Exception as e:
             logger.exception("Error creating transfer recipient: %s", str(e))
-            return {"status": False, "message": f"Error creating recipient: {str(e)}"}
+            return PaystackResult(status=False, message=f"Error creating recipient: {str(e)}")
 
     def initiate_transfer(
         self, 
@@ -304,7 +570,7 @@ class PaystackService:
         recipient_code: str, 
         reason: str = "Withdrawal Payout", 
         reference: Optional[str] = None
-    ) -> Dict[str, Any]:
+    ) -> PaystackResult:
         """
         Initiate a Transfer
         amount: in kobo
@@ -319,13 +585,148 @@ class PaystackService:
             norm = self._normalize_response(response)
             
             if norm.get('status'):
-                return {"status": True, "message": "Transfer initiated", "data": norm.get('data')}
+                return PaystackResult(status=True, message="Transfer initiated", data=_pick(norm.get('data'), ('transfer_code', 'reference', 'status', 'amount')))
             else:
-                return {"status": False, "message": norm.get('message', "Failed to initiate transfer")}
+                # A 5xx reply does not say whether the transfer was queued
+                return PaystackResult(
+                    status=False,
+                    message=norm.get('message', "Failed to initiate transfer"),
+                    outcome_unknown=(getattr(response, 'status_code', None) or 0) >= 500
+                )
                 
         except Exception as e:
             logger.exception("Error initiating transfer: %s", str(e))
-            return {"status": False, "message": f"Error initiating transfer: {str(e)}"}
+            return PaystackResult(status=False, message=f"Error initiating transfer: {str(e)}", outcome_unknown=True)
+
+    def initiate_bulk_transfers(self, transfers: List[Dict[str, Any]]) -> PaystackResult:
+        """
+        Initiate many transfers through Paystack's bulk endpoint, one request per
+        PAYSTACK_BULK_TRANSFER_LIMIT transfers.
+
+        Args:
+            transfers: dicts with amount (kobo), recipient (recipient code), reference and reason
+
+        Returns per-transfer results in 'data'; 'errors' lists the chunks that failed.
+        """
+        results = []
+        errors = []
+        for offset in range(0, len(transfers), PAYSTACK_BULK_TRANSFER_LIMIT):
+            chunk = transfers[offset:offset + PAYSTACK_BULK_TRANSFER_LIMIT]
+            try:
+                response = self.transfers.bulk_transfer(
+                    transfers=[
+                        TransferInstruction(
+                            amount=t['amount'],
+                            recipient=t['recipient'],
+                            reference=t.get('reference'),
+                            reason=t.get('reason', "Withdrawal Payout")
+                        )
+                        for t in chunk
+                    ]
+                )
+                norm = self._normalize_response(response)
+
+                if norm.get('status'):
+                    results.extend(
+                        _pick(item, ('reference', 'recipient', 'amount', 'transfer_code', 'status'))
+                        for item in norm.get('data') or []
+                    )
+                else:
+                    errors.append(norm.get('message', "Failed to initiate bulk transfer"))
+
+            except Exception as e:
+                logger.exception("Error initiating bulk transfer: %s", str(e))
+                errors.append(f"Error initiating bulk transfer: {str(e)}")
+
+        return PaystackResult(
+            status=not errors,
+            message="Bulk transfer initiated" if not errors else "; ".join(errors),
+            data=results,
+            errors=errors
+        )
+
+    # --- Async Payout / Transfer Methods ---
+
+    async def a_create_transfer_recipient(
+        self,
+        name: str,
+        account_number: str,
+        bank_code: str,
+        currency: str = "NGN"
+    ) -> PaystackResult:
+        """
+        Async variant of create_transfer_recipient
+        """
+        try:
+            response = await self.async_client.transfer_recipients.create(
+                type_="nuban",
+                name=name,
+                account_number=account_number,
+                bank_code=bank_code,
+                currency=currency
+            )
+            norm = self._normalize_response(response)
+
+            if norm.get('status'):
+                return PaystackResult(status=True, message="Recipient created", data=_pick(norm.get('data'), ('recipient_code', 'name')))
+            else:
+                return PaystackResult(status=False, message=norm.get('message', "Failed to create recipient"))
+
+        except Exception as e:
+            logger.exception("Error creating transfer recipient: %s", str(e))
+            return PaystackResult(status=False, message=f"Error creating recipient: {str(e)}")
+
+    async def a_initiate_transfer(
+        self,
+        amount: int,
+        recipient_code: str,
+        reason: str = "Withdrawal Payout",
+        reference: Optional[str] = None
+    ) -> PaystackResult:
+        """
+        Async variant of initiate_transfer
+        amount: in kobo
+        """
+        try:
+            response = await self.async_client.transfers.initiate(
+                amount=amount,
+                recipient=recipient_code,
+                reason=reason,
+                reference=reference
+            )
+            norm = self._normalize_response(response)
+
+            if norm.get('status'):
+                return PaystackResult(status=True, message="Transfer initiated", data=_pick(norm.get('data'), ('transfer_code', 'reference', 'status', 'amount')))
+            else:
+                # A 5xx reply does not say whether the transfer was queued
+                return PaystackResult(
+                    status=False,
+                    message=norm.get('message', "Failed to initiate transfer"),
+                    outcome_unknown=(getattr(response, 'status_code', None) or 0) >= 500
+                )
+
+        except Exception as e:
+            logger.exception("Error initiating transfer: %s", str(e))
+            return PaystackResult(status=False, message=f"Error initiating transfer: {str(e)}", outcome_unknown=True)
+
+    async def initiate_transfers_bulk(self, items: List[Dict[str, Any]]) -> List[PaystackResult]:
+        """
+        Initiate several independent transfers concurrently.
+
+        Args:
+            items: keyword arguments for a_initiate_transfer, one dict per transfer
+
+        Returns results in the same order as items. At most PAYSTACK_BULK_CONCURRENCY
+        requests are in flight at once to stay inside Paystack's rate limits.
+        """
+        semaphore = asyncio.Semaphore(PAYSTACK_BULK_CONCURRENCY)
+
+        async def _initiate(item: Dict[str, Any]) -> PaystackResult:
+            async with semaphore:
+                return await self.a_initiate_transfer(**item)
+
+        return await asyncio.gather(*[_initiate(item) for item in items])
 
 # Instantiate service
 paystack_service = PaystackService()
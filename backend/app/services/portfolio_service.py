@@ -5,6 +5,8 @@ Handles portfolio validation, investment options, and interest calculations.
 
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta
+from functools import lru_cache
+import threading
 from ..core.config import settings
 from .notification_service import NotificationService
 
@@ -440,3 +442,25 @@ class PortfolioService:
                 'success': False,
                 'error': f'Error updating investment type: {str(e)}'
             }
+
+
+# One PortfolioService per process for callers that only need the portfolio rules;
+# constructing one builds a Supabase client, so don't do it per request
+_PORTFOLIO_SERVICE = None
+_PORTFOLIO_SERVICE_LOCK = threading.Lock()
+
+
+def get_portfolio_service() -> PortfolioService:
+    """Return the shared PortfolioService, creating it on first use."""
+    global _PORTFOLIO_SERVICE
+    if _PORTFOLIO_SERVICE is None:
+        with _PORTFOLIO_SERVICE_LOCK:
+            if _PORTFOLIO_SERVICE is None:
+                _PORTFOLIO_SERVICE = PortfolioService()
+    return _PORTFOLIO_SERVICE
+
+
+@lru_cache(maxsize=128)
+def get_investment_requirements(portfolio_type: str, investment_type: str) -> Optional[Dict[str, Any]]:
+    """Cached PortfolioService.get_investment_requirements; PORTFOLIO_RULES is static."""
+    return get_portfolio_service().get_investment_requirements(portfolio_type, investment_type)
@@ -6,20 +6,150 @@
 # - Handles withdrawal requests and status updates
 # - Provides transaction history and reporting
 
-from typing import Optional, Dict, Any, List
-from datetime import timedelta
-from datetime import datetime, date
-import uuid
-
+from typing import Optional, Dict, Any, Iterator, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import datetime, date, timezone, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+import asyncio
+import httpx
+import threading
+import os
+import secrets
+
+from ..core import cache
 from ..core.config import settings
 from .notification_service import NotificationService
 from .paystack_service import paystack_service
+from .portfolio_service import get_investment_requirements
 
 
 try:
-    from supabase import create_client
+    from supabase import create_client, ClientOptions
+    from postgrest.types import ReturnMethod
 except Exception:  # pragma: no cover - dev only
     create_client = None
+    ClientOptions = None
+    ReturnMethod = None
+
+
+# Rows per bulk INSERT; keeps each PostgREST request a reasonable size
+INSERT_BATCH_SIZE = 500
+
+# One Supabase client per process, shared by every TransactionService instance so
+# requests reuse its HTTP connection pool instead of building a new client each time
+_SUPABASE_CLIENT = None
+_SUPABASE_CLIENT_LOCK = threading.Lock()
+
+# Connection pool for the shared client. supabase-py's default session is sized for
+# light use; concurrent dashboard reads would otherwise queue for a free connection
+SUPABASE_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+# Same as postgrest's default, which only applies when it builds its own session
+SUPABASE_HTTP_TIMEOUT = 120.0
+
+
+# Columns returned by get_transaction_history and get_transaction_by_id: what
+# _normalize_tx, the history views and the PDF history/receipt read, instead of
+# the full transactions row
+HISTORY_COLUMNS = (
+    'id, transaction_id, transaction_type, amount, withdrawal_amount, initial_balance, '
+    'withdraw_status, paystack_status, paystack_ref, created_at'
+)
+
+# Rows per request when walking a full history; PostgREST caps a single response
+# at max-rows (1000 on Supabase), so unbounded selects would be silently cut short
+HISTORY_BATCH_SIZE = 1000
+
+# PostgREST filter for non-deleted transactions (is_deleted IS NOT TRUE), matching
+# the idx_tx_active partial index
+ACTIVE_TX_FILTER = ('is_deleted', 'not.is', 'true')
+
+# Upper bound on payouts in flight at once in process_payouts_bulk
+PAYOUT_CONCURRENCY = 10
+
+# Random hex characters in generated transaction IDs (INIT-XXXXXXXXXXXX etc.)
+TX_ID_SUFFIX_BYTES = 6
+
+
+def _tx_id_suffix() -> str:
+    """Random uppercase hex suffix for a single transaction ID."""
+    return secrets.token_hex(TX_ID_SUFFIX_BYTES).upper()
+
+
+def _tx_id_suffixes(count: int) -> List[str]:
+    """`count` transaction ID suffixes from a single urandom read, for bulk inserts."""
+    raw = os.urandom(TX_ID_SUFFIX_BYTES * count).hex().upper()
+    width = TX_ID_SUFFIX_BYTES * 2
+    return [raw[i:i + width] for i in range(0, len(raw), width)]
+
+
+def _transfer_reference(transaction_id: str) -> str:
+    """Paystack transfer reference for a withdrawal.
+    Derived from the transaction ID so a repeated payout of the same withdrawal
+    reuses it and Paystack refuses the duplicate transfer.
+    """
+    return f"trf-{transaction_id.lower()}"
+
+
+# Background workers for notification writes that the caller doesn't need to wait for
+_notify_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='tx-notify')
+
+
+def _persist_notification(investor_id: str, notification: Dict[str, Any]) -> None:
+    """Save a generated notification to the database; runs on _notify_pool."""
+    try:
+        from .notification_persistence_service import NotificationPersistenceService
+        notification_service = NotificationPersistenceService()
+        notification_service.create_notification(
+            investor_id=investor_id,
+            title=notification['title'],
+            message=notification['message'],
+            notification_type=notification['type'],
+            event_type=notification['eventType'],
+            metadata=notification.get('metadata')
+        )
+    except Exception as persist_error:
+        print(f"Failed to persist notification: {persist_error}")
+
+
+@lru_cache(maxsize=1024)
+def _describe_tx(ttype: Optional[str], amount: Any) -> Optional[str]:
+    """Display description for a transaction type and amount.
+
+    History pages repeat the same (type, amount) pairs, so the amount formatting
+    is cached rather than redone for every row.
+    """
+    try:
+        num_amount = float(amount)
+    except Exception:
+        num_amount = None
+
+    if ttype == 'withdrawal':
+        return f'Withdrawal of ₦{num_amount:,.2f}' if num_amount is not None else 'Withdrawal'
+    if ttype in ('payment', 'topup'):
+        return f'{ttype.capitalize()} of ₦{num_amount:,.2f}' if num_amount is not None else ttype.capitalize()
+    if ttype == 'points_redemption':
+        return f'Points redemption added ₦{num_amount:,.2f}' if num_amount is not None else 'Points redemption'
+    return ttype
+
+
+def _get_client():
+    global _SUPABASE_CLIENT
+    if _SUPABASE_CLIENT is None:
+        with _SUPABASE_CLIENT_LOCK:
+            if _SUPABASE_CLIENT is None:
+                http_client = httpx.Client(
+                    limits=SUPABASE_HTTP_LIMITS,
+                    timeout=SUPABASE_HTTP_TIMEOUT,
+                    follow_redirects=True,
+                    http2=True,
+                )
+                _SUPABASE_CLIENT = create_client(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_SERVICE_ROLE_KEY,
+                    options=ClientOptions(httpx_client=http_client),
+                )
+    return _SUPABASE_CLIENT
 
 
 class TransactionService:
@@ -41,61 +171,101 @@ class TransactionService:
         if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
             raise RuntimeError("Supabase config missing in settings")
 
-        self.supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
-
-    def record_initial_transaction(self, investor_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Record the initial investment transaction when an investor is created.
+        self.supabase = _get_client()
+
+    @staticmethod
+    def _unpack(resp: Any) -> Tuple[Any, Any]:
+        """Return (data, error) from a Supabase response or a plain dict."""
+        if type(resp) is dict:
+            return resp.get('data'), resp.get('error')
+        return getattr(resp, 'data', None), getattr(resp, 'error', None)
+
+    @staticmethod
+    def _invalidate_totals(*records: Dict[str, Any]) -> None:
+        """Drop cached balance / amount-due entries for the accounts and investors of written rows."""
+        keys = set()
+        for record in records:
+            if record.get('account_number'):
+                keys.add(cache.balance_key(record['account_number']))
+            if record.get('investor_id'):
+                keys.add(cache.amount_due_key(record['investor_id']))
+        cache.delete(*keys)
+
+    @staticmethod
+    def _build_initial_record(investor_data: Dict[str, Any], tx_id_suffix: str, now_iso: str) -> Dict[str, Any]:
+        """Map an investors row onto its initial-investment transaction record."""
+        return {
+            'email': investor_data['email'],
+            'account_number': investor_data['account_number'],
+            'initial_balance': investor_data.get('initial_investment', 0),
+            'portfolio_type': investor_data.get('portfolio_type'),
+            'investment_type': investor_data.get('investment_type'),
+            'amount_due': 0,  # Initial investment has no due amount
+            'last_due_date': None,
+            'withdrawal_requested': False,
+            'withdraw_status': 'none',
+            'failure_reason': None,
+            'transaction_id': f"INIT-{tx_id_suffix}",
+            'paystack_ref': investor_data.get('paystack_reference'),
+            'paystack_status': investor_data.get('payment_status', 'pending'),
+            'transaction_type': 'initial',
+            'amount': investor_data.get('initial_investment', 0),
+            'withdrawal_timestamp': None,
+            'paystack_timestamp': now_iso if investor_data.get('paystack_reference') else None,
+            'investor_id': investor_data['id']
+        }
+
+    def record_initial_transactions_bulk(self, investor_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Record initial investment transactions for many investors at once.
 
         Args:
-            investor_data: Dictionary containing investor information from investors table
+            investor_list: Investor dictionaries from the investors table
 
         Returns:
-            Dict with success status and data/error
+            Dict with success status and the inserted rows (data) or error
         """
         try:
-            transaction_record = {
-                'email': investor_data['email'],
-                'account_number': investor_data['account_number'],
-                'initial_balance': investor_data.get('initial_investment', 0),
-                'portfolio_type': investor_data.get('portfolio_type'),
-                'investment_type': investor_data.get('investment_type'),
-                'amount_due': 0,  # Initial investment has no due amount
-                'last_due_date': None,
-                'withdrawal_requested': False,
-                'withdraw_status': 'none',
-                'failure_reason': None,
-                'transaction_id': f"INIT-{uuid.uuid4().hex[:12].upper()}",
-                'paystack_ref': investor_data.get('paystack_reference'),
-                'paystack_status': investor_data.get('payment_status', 'pending'),
-                'transaction_type': 'initial',
-                'amount': investor_data.get('initial_investment', 0),
-                'withdrawal_timestamp': None,
-                'paystack_timestamp': datetime.utcnow().isoformat() if investor_data.get('paystack_reference') else None,
-                'investor_id': investor_data['id']
-            }
+            # One timestamp for the whole batch; created_at is filled in by Postgres
+            now_iso = datetime.now(timezone.utc).isoformat()
+            suffixes = _tx_id_suffixes(len(investor_list))
+            transaction_records = [
+                self._build_initial_record(investor, suffix, now_iso)
+                for investor, suffix in zip(investor_list, suffixes)
+            ]
 
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
-            resp = self.supabase.table('transactions').insert(transaction_record).execute()
+            inserted = []
+            for offset in range(0, len(transaction_records), INSERT_BATCH_SIZE):
+                resp = self.supabase.table('transactions').insert(transaction_records[offset:offset + INSERT_BATCH_SIZE]).execute()
 
-            data = None
-            error = None
-            if isinstance(resp, dict):
-                data = resp.get('data')
-                error = resp.get('error')
-            else:
-                data = getattr(resp, 'data', None)
-                error = getattr(resp, 'error', None)
+                data, error = self._unpack(resp)
 
-            if data:
-                return {'success': True, 'data': data[0] if isinstance(data, list) else data}
-            else:
-                return {'success': False, 'error': f'Failed to insert transaction record: {error}'}
+                if not data:
+                    return {'success': False, 'error': f'Failed to insert transaction record: {error}', 'data': inserted}
+                inserted.extend(data if isinstance(data, list) else [data])
+
+            self._invalidate_totals(*transaction_records)
+            return {'success': True, 'data': inserted}
 
         except Exception as e:
             return {'success': False, 'error': f'Error recording initial transaction: {str(e)}'}
 
+    def record_initial_transaction(self, investor_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Record the initial investment transaction when an investor is created.
+
+        Args:
+            investor_data: Dictionary containing investor information from investors table
+
+        Returns:
+            Dict with success status and data/error
+        """
+        result = self.record_initial_transactions_bulk([investor_data])
+        if result['success']:
+            return {'success': True, 'data': result['data'][0]}
+        return {'success': False, 'error': result['error']}
+
     def record_paystack_transaction(self, transaction_data: Dict[str, Any], investor_id: Optional[str] = None) -> Dict[str, Any]:
         """Record a paystack transaction (subsequent payments).
 
@@ -113,95 +283,36 @@ class TransactionService:
             status = transaction_data.get('status', 'pending')
             email = transaction_data.get('customer', {}).get('email')
             paid_at = transaction_data.get('paid_at')
-
-            # If investor_id not provided, try to find it from email
-            if not investor_id and email:
-                if self.supabase is None:
-                    return {'success': False, 'error': 'Supabase client not initialized'}
-                    
-                investor_resp = self.supabase.table('investors').select('id, account_number, portfolio_type, investment_type').eq('email', email).execute()
-                
-                data = None
-                error = None
-                if isinstance(investor_resp, dict):
-                    data = investor_resp.get('data')
-                    error = investor_resp.get('error')
-                else:
-                    data = getattr(investor_resp, 'data', None)
-                    error = getattr(investor_resp, 'error', None)
-                
-                if data and len(data) > 0:
-                    investor = data[0]
-                    investor_id = investor['id']
-                    account_number = investor['account_number']
-                    profile_type = investor['portfolio_type']
-                    investment_type = investor.get('investment_type')
-                else:
-                    return {'success': False, 'error': f'Investor not found for email: {error}'}
+            # paid_at arrives as an ISO string or, from the pypaystack2 models, a datetime
+            if isinstance(paid_at, datetime):
+                paystack_timestamp = paid_at.isoformat()
+            elif paid_at:
+                paystack_timestamp = datetime.fromisoformat(paid_at.replace('Z', '+00:00')).isoformat()
             else:
-                # Get investor details if investor_id is provided
-                if self.supabase is None:
-                    return {'success': False, 'error': 'Supabase client not initialized'}
-                    
-                investor_resp = self.supabase.table('investors').select('account_number, portfolio_type, investment_type, email').eq('id', investor_id).execute()
-                
-                data = None
-                error = None
-                if isinstance(investor_resp, dict):
-                    data = investor_resp.get('data')
-                    error = investor_resp.get('error')
-                else:
-                    data = getattr(investor_resp, 'data', None)
-                    error = getattr(investor_resp, 'error', None)
-                
-                if data and len(data) > 0:
-                    investor = data[0]
-                    account_number = investor['account_number']
-                    profile_type = investor['portfolio_type']
-                    investment_type = investor.get('investment_type')
-                    email = investor['email']
-                else:
-                    return {'success': False, 'error': f'Investor not found: {error}'}
-
-            transaction_record = {
-                'email': email,
-                'account_number': account_number,
-                'initial_balance': 0,  # Not applicable for subsequent transactions
-                'profile_type': profile_type,
-                'investment_type': investment_type,
-                'amount_due': 0,  # Will be calculated based on business logic
-                'last_due_date': None,
-                'withdrawal_requested': False,
-                'withdraw_status': 'none',
-                'failure_reason': None,
-                'transaction_id': f"PAY-{uuid.uuid4().hex[:12].upper()}",
-                'paystack_ref': reference,
-                'paystack_status': status,
-                'transaction_type': 'payment',
-                'amount': amount,
-                'withdrawal_timestamp': None,
-                'paystack_timestamp': datetime.fromisoformat(paid_at.replace('Z', '+00:00')).isoformat() if paid_at else datetime.utcnow().isoformat(),
-                'investor_id': investor_id
-            }
+                paystack_timestamp = datetime.now(timezone.utc).isoformat()
 
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
-            resp = self.supabase.table('transactions').insert(transaction_record).execute()
-
-            data = None
-            error = None
-            if isinstance(resp, dict):
-                data = resp.get('data')
-                error = resp.get('error')
-            else:
-                data = getattr(resp, 'data', None)
-                error = getattr(resp, 'error', None)
-
-            if data:
-                return {'success': True, 'data': data[0] if isinstance(data, list) else data}
-            else:
-                return {'success': False, 'error': f'Failed to insert paystack transaction record: {error}'}
+            # Investor lookup (by id, else by email) and insert happen in one round trip
+            resp = self.supabase.rpc('insert_paystack_tx_with_investor', {
+                'p_transaction_id': f"PAY-{_tx_id_suffix()}",
+                'p_reference': reference,
+                'p_amount': amount,
+                'p_status': status,
+                'p_paystack_timestamp': paystack_timestamp,
+                'p_email': email,
+                'p_investor_id': investor_id
+            }).execute()
+
+            outcome = getattr(resp, 'data', None)
+            if not isinstance(outcome, dict):
+                return {'success': False, 'error': 'Failed to insert paystack transaction record: unexpected response'}
+            if not outcome.get('success'):
+                return {'success': False, 'error': f"Failed to insert paystack transaction record: {outcome.get('error')}"}
+
+            self._invalidate_totals(outcome['data'])
+            return {'success': True, 'data': outcome['data']}
 
         except Exception as e:
             return {'success': False, 'error': f'Error recording paystack transaction: {str(e)}'}
@@ -225,20 +336,13 @@ class TransactionService:
             investor_id = withdrawal_data['investor_id']
             amount = withdrawal_data['amount']
 
-            # Get investor details including bank information
+            # Get the investor details copied onto the withdrawal record
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
                 
-            investor_resp = self.supabase.table('investors').select('email, portfolio_type, investment_type, bank_name, bank_account_name, bank_account_number').eq('id', investor_id).execute()
+            investor_resp = self.supabase.table('investors').select('email, portfolio_type, investment_type').eq('id', investor_id).execute()
             
-            data = None
-            error = None
-            if isinstance(investor_resp, dict):
-                data = investor_resp.get('data')
-                error = investor_resp.get('error')
-            else:
-                data = getattr(investor_resp, 'data', None)
-                error = getattr(investor_resp, 'error', None)
+            data, error = self._unpack(investor_resp)
             
             if not data or len(data) == 0:
                 return {'success': False, 'error': f'Investor not found: {error}'}
@@ -257,12 +361,12 @@ class TransactionService:
                 'withdrawal_requested': True,
                 'withdraw_status': 'pending',
                 'failure_reason': None,
-                'transaction_id': f"WITHDRAW-{uuid.uuid4().hex[:12].upper()}",
+                'transaction_id': f"WITHDRAW-{_tx_id_suffix()}",
                 'paystack_ref': None,
                 'paystack_status': None,
                 'transaction_type': 'withdrawal',
                 'amount': amount,
-                'withdrawal_timestamp': datetime.utcnow().isoformat(),
+                'withdrawal_timestamp': datetime.now(timezone.utc).isoformat(),
                 'paystack_timestamp': None,
                 'investor_id': investor_id
             }
@@ -272,16 +376,11 @@ class TransactionService:
 
             resp = self.supabase.table('transactions').insert(transaction_record).execute()
 
-            data = None
-            error = None
-            if isinstance(resp, dict):
-                data = resp.get('data')
-                error = resp.get('error')
-            else:
-                data = getattr(resp, 'data', None)
-                error = getattr(resp, 'error', None)
+            data, error = self._unpack(resp)
 
             if data:
+                self._invalidate_totals(transaction_record)
+
                 # Generate notification for withdrawal request
                 notification = NotificationService.generate_withdrawal_requested_notification(
                     investor_id=investor_id,
@@ -349,6 +448,89 @@ class TransactionService:
         except Exception as e:
             return {'success': False, 'error': f'Error verifying account: {str(e)}'}
 
+    def _prepare_payout(self, transaction_id: str) -> Dict[str, Any]:
+        """Claim a withdrawal for payout and load the investor's bank details."""
+        if self.supabase is None:
+            return {'success': False, 'error': 'Supabase client not initialized'}
+
+        # Status check and payout claim in one conditional UPDATE, which also
+        # returns the investor's bank details
+        resp = self.supabase.rpc('claim_withdrawal', {'p_transaction_id': transaction_id}).execute()
+
+        outcome = getattr(resp, 'data', None)
+        if not isinstance(outcome, dict):
+            return {'success': False, 'error': 'Failed to claim withdrawal: unexpected response'}
+        if not outcome.get('success'):
+            return {'success': False, 'error': outcome.get('error')}
+
+        claim = outcome['data']
+
+        bank_name = claim.get('bank_name')
+        account_number = claim.get('bank_account_number')
+        
+        if not bank_name or not account_number:
+            return self._release_payout_claim(transaction_id, 'Missing bank details for investor')
+            
+        # 1. Resolve Bank Code
+        bank_code = paystack_service.resolve_bank_code(bank_name)
+        if not bank_code:
+            return self._release_payout_claim(
+                transaction_id, f"Could not resolve bank code for '{bank_name}'. Please verify bank name."
+            )
+
+        return {
+            'success': True,
+            'account_name': claim.get('bank_account_name') or "Investor",
+            'account_number': account_number,
+            'bank_code': bank_code,
+            # Amount in kobo
+            'amount_kobo': int(Decimal(str(claim.get('amount') or 0)) * 100),
+            'reference': _transfer_reference(transaction_id)
+        }
+
+    def _release_payout_claim(self, transaction_id: str, error: str) -> Dict[str, Any]:
+        """Drop the payout claim after a failure before any transfer was sent, so the
+        payout can be retried straight away. Returns the failure result for error."""
+        try:
+            self.supabase.table('transactions')\
+                .update({'payout_claimed_at': None}, returning=ReturnMethod.minimal)\
+                .eq('transaction_id', transaction_id)\
+                .execute()
+        except Exception as e:
+            # The claim then lapses after claim_withdrawal's stale window
+            print(f"Failed to release payout claim for {transaction_id}: {str(e)}")
+        return {'success': False, 'error': error}
+
+    def _transfer_failed(self, transaction_id: str, transfer_resp: Any) -> Dict[str, Any]:
+        """Handle a transfer Paystack did not accept.
+        A definitive rejection fails the withdrawal with the reason; when the outcome is
+        unknown the claim is kept, so only the stale-claim window allows another attempt.
+        """
+        error = f"Transfer initiation failed: {transfer_resp.get('message')}"
+        if not transfer_resp.get('outcome_unknown'):
+            self.update_withdrawal_status(transaction_id, 'failed', failure_reason=error)
+        return {'success': False, 'error': error}
+
+    def _finalize_payout(self, transaction_id: str, transfer_data: Dict[str, Any], reference: str) -> Dict[str, Any]:
+        """Mark a withdrawal as sent once Paystack has accepted the transfer."""
+        paystack_ref = transfer_data.get('transfer_code') or transfer_data.get('reference') or reference
+        
+        # 4. Update Transaction
+        # Status 'sent' and the Paystack reference in the same update, so the row
+        # is never 'sent' without a reference for webhook correlation
+        result = self.update_withdrawal_status(transaction_id, 'sent', extra_fields={
+            'paystack_ref': paystack_ref,
+            'paystack_status': 'success'  # Or 'pending' depending on if we want to wait for webhook
+        })
+        if not result['success']:
+            return result
+        
+        return {
+            'success': True,
+            'message': 'Payout initiated successfully',
+            'data': transfer_data
+        }
+
     def process_payout(self, transaction_id: str) -> Dict[str, Any]:
         """Process a payout for a withdrawal via Paystack.
 
@@ -359,242 +541,236 @@ class TransactionService:
             Dict with success status and data/error
         """
         try:
-            if self.supabase is None:
-                return {'success': False, 'error': 'Supabase client not initialized'}
-
-            # Get transaction details
-            tx_resp = self.supabase.table('transactions').select('*').eq('transaction_id', transaction_id).execute()
-            
-            tx_data = getattr(tx_resp, 'data', [])
-            if not tx_data:
-                return {'success': False, 'error': 'Transaction not found'}
-            
-            transaction = tx_data[0]
-            
-            # Verify status
-            if transaction.get('withdraw_status') not in ['pending', 'processing']:
-                return {'success': False, 'error': f"Invalid status for payout: {transaction.get('withdraw_status')}"}
-                
-            investor_id = transaction.get('investor_id')
-            amount = float(transaction.get('amount', 0))
-            
-            # Get investor bank details
-            inv_resp = self.supabase.table('investors').select('bank_name, bank_account_number, bank_account_name, email').eq('id', investor_id).execute()
-            inv_data = getattr(inv_resp, 'data', [])
-            if not inv_data:
-                return {'success': False, 'error': 'Investor details not found'}
-                
-            investor = inv_data[0]
-            bank_name = investor.get('bank_name')
-            account_number = investor.get('bank_account_number')
-            account_name = investor.get('bank_account_name')
-            
-            if not bank_name or not account_number:
-                return {'success': False, 'error': 'Missing bank details for investor'}
-                
-            # 1. Resolve Bank Code
-            bank_code = paystack_service.resolve_bank_code(bank_name)
-            if not bank_code:
-                return {'success': False, 'error': f"Could not resolve bank code for '{bank_name}'. Please verify bank name."}
+            payout = self._prepare_payout(transaction_id)
+            if not payout['success']:
+                return payout
                 
             # 2. Create Transfer Recipient
             recipient_resp = paystack_service.create_transfer_recipient(
-                name=account_name or "Investor",
-                account_number=account_number,
-                bank_code=bank_code
+                name=payout['account_name'],
+                account_number=payout['account_number'],
+                bank_code=payout['bank_code']
             )
             
             if not recipient_resp['status']:
-                return {'success': False, 'error': f"Failed to create transfer recipient: {recipient_resp.get('message')}"}
+                return self._release_payout_claim(
+                    transaction_id, f"Failed to create transfer recipient: {recipient_resp.get('message')}"
+                )
                 
-            recipient_code = recipient_resp['data'].get('recipient_code')
-            
             # 3. Initiate Transfer
-            # Amount in kobo
-            amount_kobo = int(amount * 100)
-            reference = f"TRF-{uuid.uuid4().hex[:12].upper()}"
-            
             transfer_resp = paystack_service.initiate_transfer(
-                amount=amount_kobo,
-                recipient_code=recipient_code,
+                amount=payout['amount_kobo'],
+                recipient_code=recipient_resp['data'].get('recipient_code'),
                 reason=f"Withdrawal for {transaction_id}",
-                reference=reference
+                reference=payout['reference']
             )
             
             if not transfer_resp['status']:
-                return {'success': False, 'error': f"Transfer initiation failed: {transfer_resp.get('message')}"}
+                return self._transfer_failed(transaction_id, transfer_resp)
+                
+            return self._finalize_payout(transaction_id, transfer_resp['data'], payout['reference'])
+
+        except Exception as e:
+            return {'success': False, 'error': f'Error processing payout: {str(e)}'}
+
+    async def process_payout_async(self, transaction_id: str) -> Dict[str, Any]:
+        """process_payout using the async Paystack client; Supabase calls run in worker threads."""
+        try:
+            payout = await asyncio.to_thread(self._prepare_payout, transaction_id)
+            if not payout['success']:
+                return payout
                 
-            transfer_data = transfer_resp['data']
-            paystack_ref = transfer_data.get('transfer_code') or transfer_data.get('reference') or reference
+            recipient_resp = await paystack_service.a_create_transfer_recipient(
+                name=payout['account_name'],
+                account_number=payout['account_number'],
+                bank_code=payout['bank_code']
+            )
             
-            # 4. Update Transaction
-            # Update status to 'sent' and save reference
-            result = self.update_withdrawal_status(transaction_id, 'sent')
-            if not result['success']:
-                return result
+            if not recipient_resp['status']:
+                return await asyncio.to_thread(
+                    self._release_payout_claim,
+                    transaction_id, f"Failed to create transfer recipient: {recipient_resp.get('message')}"
+                )
                 
-            # Also update the paystack_ref
-            self.supabase.table('transactions').update({
-                'paystack_ref': paystack_ref,
-                'paystack_status': 'success' # Or 'pending' depending on if we want to wait for webhook
-            }).eq('transaction_id', transaction_id).execute()
+            transfer_resp = await paystack_service.a_initiate_transfer(
+                amount=payout['amount_kobo'],
+                recipient_code=recipient_resp['data'].get('recipient_code'),
+                reason=f"Withdrawal for {transaction_id}",
+                reference=payout['reference']
+            )
             
-            return {
-                'success': True,
-                'message': 'Payout initiated successfully',
-                'data': transfer_data
-            }
+            if not transfer_resp['status']:
+                return await asyncio.to_thread(self._transfer_failed, transaction_id, transfer_resp)
+                
+            return await asyncio.to_thread(self._finalize_payout, transaction_id, transfer_resp['data'], payout['reference'])
 
         except Exception as e:
             return {'success': False, 'error': f'Error processing payout: {str(e)}'}
 
-    def update_withdrawal_status(self, transaction_id: str, status: str, failure_reason: Optional[str] = None) -> Dict[str, Any]:
+    async def process_payouts_bulk(self, transaction_ids: List[str]) -> Dict[str, Any]:
+        """Process several payouts concurrently, at most PAYOUT_CONCURRENCY at a time.
+
+        Returns:
+            Dict with per-transaction results keyed by transaction ID
+        """
+        semaphore = asyncio.Semaphore(PAYOUT_CONCURRENCY)
+
+        async def _payout(transaction_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.process_payout_async(transaction_id)
+
+        outcomes = await asyncio.gather(*[_payout(tid) for tid in transaction_ids], return_exceptions=True)
+
+        results = {
+            tid: outcome if isinstance(outcome, dict) else {'success': False, 'error': f'Error processing payout: {str(outcome)}'}
+            for tid, outcome in zip(transaction_ids, outcomes)
+        }
+        return {
+            'success': all(r['success'] for r in results.values()),
+            'processed_count': sum(1 for r in results.values() if r['success']),
+            'results': results
+        }
+
+    def update_withdrawal_status(self, transaction_id: str, status: str, failure_reason: Optional[str] = None,
+                                 extra_fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Update the status of a withdrawal transaction.
 
         Args:
             transaction_id: The transaction ID to update
             status: New status (pending, failed, sent)
             failure_reason: Reason for failure if status is 'failed'
+            extra_fields: Optional paystack_ref / paystack_status to set in the same update
 
         Returns:
             Dict with success status and data/error
         """
         try:
-            update_data = {
-                'withdraw_status': status,
-                'updated_at': datetime.utcnow().isoformat()
-            }
-
-            if status == 'failed' and failure_reason:
-                update_data['failure_reason'] = failure_reason
-
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
-            # First, get the transaction details before updating
-            transaction_resp = self.supabase.table('transactions').select('investor_id, amount, amount_due, transaction_type').eq('transaction_id', transaction_id).execute()
-            
-            transaction_data = None
-            transaction_error = None
-            if isinstance(transaction_resp, dict):
-                transaction_data = transaction_resp.get('data')
-                transaction_error = transaction_resp.get('error')
-            else:
-                transaction_data = getattr(transaction_resp, 'data', None)
-                transaction_error = getattr(transaction_resp, 'error', None)
-            
-            if not transaction_data or len(transaction_data) == 0:
-                return {'success': False, 'error': f'Transaction not found: {transaction_error}'}
-            
-            transaction = transaction_data[0]
-            
-            # If this is a withdrawal being marked as 'sent', update investor's amount_due and total_paid
-            if status == 'sent' and transaction['transaction_type'] == 'withdrawal':
-                investor_id = transaction['investor_id']
-                withdrawal_amount = float(transaction['amount'])
-                
-                # Get current investor data
-                investor_resp = self.supabase.table('investors').select('id').eq('id', investor_id).execute()
-                
-                investor_data = None
-                investor_error = None
-                if isinstance(investor_resp, dict):
-                    investor_data = investor_resp.get('data')
-                    investor_error = investor_resp.get('error')
-                else:
-                    investor_data = getattr(investor_resp, 'data', None)
-                    investor_error = getattr(investor_resp, 'error', None)
-                
-                if investor_data and len(investor_data) > 0:
-                    # Update the transaction with the sent status and withdrawal_amount
-                    update_data['withdrawal_amount'] = str(withdrawal_amount)
-                    resp = self.supabase.table('transactions').update(update_data).eq('transaction_id', transaction_id).execute()
-                    
-                    # NOTE: We no longer increment total_paid here. 
-                    # total_paid is incremented in InterestCalculationService when interest is yielding 
-                    # into the spending account. Incrementing here on withdrawal would double-count.
-                else:
-                    return {'success': False, 'error': f'Investor not found: {investor_error}'}
-            else:
-                # For other status updates, just update the transaction
-                resp = self.supabase.table('transactions').update(update_data).eq('transaction_id', transaction_id).execute()
-
-            data = None
-            error = None
-            if isinstance(resp, dict):
-                data = resp.get('data')
-                error = resp.get('error')
-            else:
-                data = getattr(resp, 'data', None)
-                error = getattr(resp, 'error', None)
-
-            if data:
-                result = {'success': True, 'data': data[0] if isinstance(data, list) else data}
-
-                # Generate notification for status update
-                investor_id = transaction['investor_id']
-                amount = transaction['amount']
-
-                if status == 'sent':
-                    result['notification'] = NotificationService.generate_withdrawal_completed_notification(
-                        investor_id=investor_id,
-                        amount=amount
-                    )
-                elif status == 'failed':
-                    reason = failure_reason or "Unknown error"
-                    result['notification'] = NotificationService.generate_withdrawal_failed_notification(
-                        investor_id=investor_id,
-                        amount=amount,
-                        reason=reason
-                    )
+            # Lookup, status update and (for sent withdrawals) the payout amount
+            # happen in one round trip inside the database function
+            resp = self.supabase.rpc('process_withdrawal_status_update', {
+                'p_transaction_id': transaction_id,
+                'p_status': status,
+                'p_reason': failure_reason,
+                'p_extra': extra_fields
+            }).execute()
+
+            outcome = getattr(resp, 'data', None)
+            if not isinstance(outcome, dict):
+                return {'success': False, 'error': 'Failed to update withdrawal status: unexpected response'}
+            if not outcome.get('success'):
+                return {'success': False, 'error': outcome.get('error')}
+
+            transaction = outcome['data']
+            self._invalidate_totals(transaction)
+            result = {'success': True, 'data': transaction}
+
+            # Generate notification for status update
+            investor_id = transaction['investor_id']
+            amount = transaction['amount']
+
+            if status == 'sent':
+                result['notification'] = NotificationService.generate_withdrawal_completed_notification(
+                    investor_id=investor_id,
+                    amount=amount
+                )
+            elif status == 'failed':
+                reason = failure_reason or "Unknown error"
+                result['notification'] = NotificationService.generate_withdrawal_failed_notification(
+                    investor_id=investor_id,
+                    amount=amount,
+                    reason=reason
+                )
 
-                return result
-            else:
-                return {'success': False, 'error': f'Failed to update withdrawal status: {error}'}
+            return result
 
         except Exception as e:
             return {'success': False, 'error': f'Error updating withdrawal status: {str(e)}'}
 
-    def get_transaction_history(self, investor_id: str, transaction_type: Optional[str] = None) -> Dict[str, Any]:
-        """Get transaction history for an investor.
+    def iter_transaction_history(self, investor_id: str, transaction_type: Optional[str] = None,
+                                 batch_size: int = HISTORY_BATCH_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        """Yield an investor's full transaction history in batches, newest first.
+
+        Batches are fetched with a keyset cursor on (created_at, id), so each
+        request reads the next slice off idx_tx_active instead of skipping an
+        ever-growing offset, and at most one batch is held at a time.
+        Raises on query failure.
+        """
+        cursor = None
+        while True:
+            query = self.supabase.table('transactions').select(HISTORY_COLUMNS).eq('investor_id', investor_id)
+            query = query.filter(*ACTIVE_TX_FILTER)
+            if transaction_type:
+                query = query.eq('transaction_type', transaction_type)
+            if cursor:
+                created_at, tx_id = cursor
+                query = query.or_(f'created_at.lt."{created_at}",and(created_at.eq."{created_at}",id.lt.{tx_id})')
+
+            resp = query.order('created_at', desc=True).order('id', desc=True).limit(batch_size).execute()
+            data, error = self._unpack(resp)
+            if data is None:
+                raise RuntimeError(f'Failed to retrieve transaction history: {error}')
+            if not data:
+                return
+
+            yield [self._normalize_tx(tx) for tx in data]
+
+            if len(data) < batch_size:
+                return
+            cursor = (data[-1]['created_at'], data[-1]['id'])
+
+    def get_transaction_history(self, investor_id: str, transaction_type: Optional[str] = None,
+                                limit: Optional[int] = 50, offset: int = 0) -> Dict[str, Any]:
+        """Get transaction history for an investor, newest first.
 
         Args:
             investor_id: The investor ID
             transaction_type: Optional filter by transaction type
+            limit: Page size; None returns the full history (e.g. for exports),
+                fetched in HISTORY_BATCH_SIZE batches
+            offset: Number of transactions to skip
 
         Returns:
-            Dict with success status and transaction list/error
+            Dict with success status and transaction list/error. The first
+            page (offset 0) also carries 'total', the full matching count.
         """
         try:
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
-            query = self.supabase.table('transactions').select('*').eq('investor_id', investor_id)
+            if limit is None:
+                history = []
+                for batch in self.iter_transaction_history(investor_id, transaction_type):
+                    history.extend(batch)
+                return {'success': True, 'data': history}
+
+            # Only the first page pays for the exact count; later pages reuse it
+            count = 'exact' if offset == 0 else None
+            query = self.supabase.table('transactions').select(HISTORY_COLUMNS, count=count).eq('investor_id', investor_id)
 
             # Filter out deleted transactions
-            # We check if is_deleted is FALSE or NULL (for backward compatibility)
-            query = query.or_('is_deleted.eq.false,is_deleted.is.null')
+            # is_deleted IS NOT TRUE also keeps NULL rows (backward compatibility)
+            query = query.filter(*ACTIVE_TX_FILTER)
 
             if transaction_type:
                 query = query.eq('transaction_type', transaction_type)
 
-            query = query.order('created_at', desc=True)
+            query = query.order('created_at', desc=True).range(offset, offset + limit - 1)
 
             resp = query.execute()
 
-            data = None
-            error = None
-            if isinstance(resp, dict):
-                data = resp.get('data')
-                error = resp.get('error')
-            else:
-                data = getattr(resp, 'data', None)
-                error = getattr(resp, 'error', None)
+            data, error = self._unpack(resp)
 
             if data is not None:
                 # Normalize each transaction using helper so it includes canonical 'status' and 'description' keys
-                normalized = [self._normalize_tx(dict(tx)) for tx in data]
-                return {'success': True, 'data': normalized}
+                # Rows are fresh dicts from the response, so normalize them in place
+                normalized = [self._normalize_tx(tx) for tx in data]
+                result = {'success': True, 'data': normalized}
+                if count:
+                    result['total'] = getattr(resp, 'count', None)
+                return result
             else:
                 return {'success': False, 'error': f'Failed to retrieve transaction history: {error}'}
 
@@ -615,7 +791,7 @@ class TransactionService:
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
-            query = self.supabase.table('transactions').select('*').eq('transaction_id', transaction_id)
+            query = self.supabase.table('transactions').select(HISTORY_COLUMNS).eq('transaction_id', transaction_id)
             
             if investor_id:
                 query = query.eq('investor_id', investor_id)
@@ -624,7 +800,7 @@ class TransactionService:
             data = getattr(resp, 'data', [])
             
             if data:
-                return {'success': True, 'data': self._normalize_tx(dict(data[0]))}
+                return {'success': True, 'data': self._normalize_tx(data[0])}
             else:
                 return {'success': False, 'error': 'Transaction not found'}
         except Exception as e:
@@ -644,40 +820,31 @@ class TransactionService:
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
-            # Get all transactions for the account
-            resp = self.supabase.table('transactions').select('transaction_type, amount, withdraw_status, forfeiture_amount').eq('account_number', account_number).execute()
+            cached = cache.get_json(cache.balance_key(account_number))
+            if cached is not None:
+                return {'success': True, 'balance': cached}
 
-            data = None
-            error = None
-            if isinstance(resp, dict):
-                data = resp.get('data')
-                error = resp.get('error')
-            else:
-                data = getattr(resp, 'data', None)
-                error = getattr(resp, 'error', None)
+            # Running balance maintained by the account_balances trigger
+            resp = self.supabase.table('account_balances').select('balance').eq('account_number', account_number).limit(1).execute()
+
+            data, error = self._unpack(resp)
 
             if data is None:
-                return {'success': False, 'error': f'Failed to retrieve transactions for balance calculation: {error}'}
-
-            balance = 0
-            for transaction in data:
-                if transaction['transaction_type'] in ['initial', 'payment']:
-                    balance += transaction['amount']
-                elif transaction['transaction_type'] == 'withdrawal' and transaction['withdraw_status'] == 'sent':
-                    balance -= transaction['amount']
-                elif transaction['transaction_type'] == 'end_investment':
-                    # For end investment, subtract the forfeiture amount and add the remaining to spending account
-                    forfeiture_amount = float(transaction.get('forfeiture_amount', 0))
-                    balance -= forfeiture_amount  # Subtract forfeiture
-                    balance += (transaction['amount'] - forfeiture_amount)  # Add remaining to spending account
+                return {'success': False, 'error': f'Failed to retrieve account balance: {error}'}
 
+            # No row yet means no balance-affecting transactions on the account
+            balance = float(data[0]['balance']) if data else 0.0
+            cache.set_json(cache.balance_key(account_number), balance)
             return {'success': True, 'balance': balance}
 
         except Exception as e:
             return {'success': False, 'error': f'Error calculating account balance: {str(e)}'}
 
     def _normalize_tx(self, tx_copy: Dict[str, Any]) -> Dict[str, Any]:
-        """Normalize a single transaction record for API consumers.
+        """Normalize a single transaction record for API consumers, in place.
+
+        Rows come straight from the PostgREST response, so they are updated and
+        returned as-is rather than copied.
 
         Adds/normalizes:
         - status: unified status (prefers withdraw_status for withdrawals, paystack_status otherwise)
@@ -696,20 +863,7 @@ class TransactionService:
         # Ensure description exists for frontend display
         if 'description' not in tx_copy or not tx_copy.get('description'):
             amount = tx_copy.get('amount') or tx_copy.get('withdrawal_amount') or tx_copy.get('initial_balance') or 0
-            ttype = tx_copy.get('transaction_type', 'transaction')
-            try:
-                num_amount = float(amount)
-            except Exception:
-                num_amount = None
-
-            if ttype == 'withdrawal':
-                tx_copy['description'] = f'Withdrawal of ₦{num_amount:,.2f}' if num_amount is not None else 'Withdrawal'
-            elif ttype in ('payment', 'topup'):
-                tx_copy['description'] = f'{ttype.capitalize()} of ₦{num_amount:,.2f}' if num_amount is not None else ttype.capitalize()
-            elif ttype == 'points_redemption':
-                tx_copy['description'] = f'Points redemption added ₦{num_amount:,.2f}' if num_amount is not None else 'Points redemption'
-            else:
-                tx_copy['description'] = tx_copy.get('transaction_type', 'Transaction')
+            tx_copy['description'] = _describe_tx(tx_copy.get('transaction_type', 'Transaction'), amount)
 
         return tx_copy
 
@@ -729,75 +883,52 @@ class TransactionService:
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
             
-            # Get investor details to get portfolio type and other info
-            investor_resp = self.supabase.table('investors').select('portfolio_type, initial_investment, created_at').eq('id', investor_id).execute()
+            # Get investor details; weeks_elapsed since created_at is computed by the view
+            investor_resp = self.supabase.table('investor_weeks_elapsed').select('portfolio_type, initial_investment, weeks_elapsed').eq('id', investor_id).execute()
             
-            data = None
-            error = None
-            if isinstance(investor_resp, dict):
-                data = investor_resp.get('data')
-                error = investor_resp.get('error')
-            else:
-                data = getattr(investor_resp, 'data', None)
-                error = getattr(investor_resp, 'error', None)
+            data, error = self._unpack(investor_resp)
             
             if not data or len(data) == 0:
                 return {'success': False, 'error': f'Investor not found: {error}'}
 
             investor = data[0]
             portfolio_type = investor.get('portfolio_type')
-            initial_investment = float(investor.get('initial_investment', 0))
-            
-            # Import portfolio service to get investment rules
-            from .portfolio_service import PortfolioService
-            portfolio_service = PortfolioService()
+            # numeric columns arrive as JSON numbers; go through str() so the
+            # Decimal carries the stored value rather than its float approximation
+            initial_investment = Decimal(str(investor.get('initial_investment') or 0))
             
             # Get investment requirements
-            requirements = portfolio_service.get_investment_requirements(portfolio_type, investment_type)
+            requirements = get_investment_requirements(portfolio_type, investment_type)
             if not requirements:
                 return {'success': False, 'error': f'Invalid investment type {investment_type} for portfolio {portfolio_type}'}
             
-            # Calculate weeks elapsed since investment start
-            created_at = investor.get('created_at')
-            if isinstance(created_at, str):
-                start_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            else:
-                start_date = created_at
-
-            weeks_elapsed = (datetime.now(start_date.tzinfo) - start_date).days // 7
+            weeks_elapsed = investor.get('weeks_elapsed') or 0
             
             # Calculate amount due based on weekly interest
-            weekly_rate = requirements["weekly_interest_rate"] / 100
+            weekly_rate = Decimal(str(requirements["weekly_interest_rate"])) / 100
             weekly_interest = initial_investment * weekly_rate
-            amount_due = weekly_interest * weeks_elapsed
+            amount_due = (weekly_interest * weeks_elapsed).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
             
             # Update all transactions for this investor with the new investment type and calculated amount
             update_data = {
                 'investment_type': investment_type,
-                'amount_due': amount_due,
+                'amount_due': str(amount_due),  # exact numeric(15,2) literal
                 'portfolio_type': portfolio_type,  # Correct field name
-                'updated_at': datetime.now().isoformat()
+                'updated_at': datetime.now(timezone.utc).isoformat()
             }
             
-            # Update all transactions for this investor
-            update_resp = self.supabase.table('transactions').update(update_data).eq('investor_id', investor_id).execute()
-            
-            update_data_result = None
-            update_error = None
-            if isinstance(update_resp, dict):
-                update_data_result = update_resp.get('data')
-                update_error = update_resp.get('error')
-            else:
-                update_data_result = getattr(update_resp, 'data', None)
-                update_error = getattr(update_resp, 'error', None)
-            
-            if update_error:
-                return {'success': False, 'error': f'Failed to update transactions: {update_error}'}
+            # Update all transactions for this investor in one statement. The updated
+            # rows aren't used, so don't ship them back; postgrest raises APIError on failure.
+            self.supabase.table('transactions')\
+                .update(update_data, returning=ReturnMethod.minimal)\
+                .eq('investor_id', investor_id)\
+                .execute()
+            self._invalidate_totals({'investor_id': investor_id})
             
             return {
                 'success': True,
                 'message': f'Transactions updated with investment type {investment_type} and amount due {amount_due}',
-                'amount_due': amount_due,
+                'amount_due': float(amount_due),
                 'weeks_elapsed': weeks_elapsed
             }
             
@@ -817,92 +948,84 @@ class TransactionService:
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
             
-            # Get investor details
-            investor_resp = self.supabase.table('investors').select('id, email, initial_investment, portfolio_type, investment_type, account_number').eq('id', investor_id).execute()
-            
-            data = None
-            error = None
-            if isinstance(investor_resp, dict):
-                data = investor_resp.get('data')
-                error = investor_resp.get('error')
-            else:
-                data = getattr(investor_resp, 'data', None)
-                error = getattr(investor_resp, 'error', None)
-            
-            if not data or len(data) == 0:
-                return {'success': False, 'error': f'Investor not found: {error}'}
+            # Investor lock, status update and the end_investment record happen
+            # in one round trip inside the database function
+            resp = self.supabase.rpc('end_investment_tx', {'p_investor_id': investor_id}).execute()
 
-            investor = data[0]
-            initial_investment = float(investor.get('initial_investment', 0))
-            
-            # Calculate forfeiture (25%) and remaining amount (75%)
-            forfeiture_amount = initial_investment * 0.25
-            remaining_amount = initial_investment - forfeiture_amount
-            
-            # Update investor record to mark as ended
-            update_data = {
-                'investment_ended': True,
-                'ended_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            update_resp = self.supabase.table('investors').update(update_data).eq('id', investor_id).execute()
-            
-            update_data_result = None
-            update_error = None
-            if isinstance(update_resp, dict):
-                update_data_result = update_resp.get('data')
-                update_error = update_resp.get('error')
-            else:
-                update_data_result = getattr(update_resp, 'data', None)
-                update_error = getattr(update_resp, 'error', None)
-            
-            if update_error:
-                return {'success': False, 'error': f'Failed to update investor record: {update_error}'}
-            
-            # Record the end investment transaction
-            transaction_record = {
-                'email': investor['email'],
-                'account_number': investor['account_number'],
-                'initial_balance': initial_investment,
-                'portfolio_type': investor['portfolio_type'],
-                'investment_type': investor.get('investment_type'),
-                'amount_due': remaining_amount,  # Amount going to spending account
-                'last_due_date': date.today().isoformat(),
-                'next_due_date': None,
-                'withdrawal_requested': False,
-                'withdraw_status': 'completed',  # Mark as completed since it's going to spending account
-                'failure_reason': None,
-                'transaction_id': f"END-{uuid.uuid4().hex[:12].upper()}",
-                'paystack_ref': None,
-                'paystack_status': 'completed',
-                'transaction_type': 'end_investment',
-                'amount': initial_investment,
+            outcome = getattr(resp, 'data', None)
+            if not isinstance(outcome, dict):
+                return {'success': False, 'error': 'Failed to end investment: unexpected response'}
+            if not outcome.get('success'):
+                return {'success': False, 'error': outcome.get('error')}
+
+            self._invalidate_totals(outcome['data'])
+            forfeiture_amount = outcome['forfeiture_amount']
+            remaining_amount = outcome['remaining_amount']
+
+            result = {
+                'success': True,
+                'data': outcome['data'],
+                'message': f'Investment ended successfully. {remaining_amount} transferred to spending account.',
                 'forfeiture_amount': forfeiture_amount,
-                'withdrawal_timestamp': datetime.now().isoformat(),
-                'paystack_timestamp': datetime.now().isoformat(),
-                'investor_id': investor_id
+                'remaining_amount': remaining_amount
             }
 
-            transaction_resp = self.supabase.table('transactions').insert(transaction_record).execute()
-
-            transaction_data = None
-            transaction_error = None
-            if isinstance(transaction_resp, dict):
-                transaction_data = transaction_resp.get('data')
-                transaction_error = transaction_resp.get('error')
-            else:
-                transaction_data = getattr(transaction_resp, 'data', None)
-                transaction_error = getattr(transaction_resp, 'error', None)
+            # Generate notification for investment ended and persist it
+            notification = NotificationService.generate_investment_ended_notification(
+                investor_id=investor_id,
+                returned_amount=remaining_amount
+            )
             
-            if transaction_error:
-                return {'success': False, 'error': f'Failed to record end investment transaction: {transaction_error}'}
+            # Persist the notification in the background; the response doesn't wait on it
+            _notify_pool.submit(_persist_notification, investor_id, notification)
             
-            return {'success': True, 'data': transaction_data}
+            result['notification'] = notification
+
+            return result
             
         except Exception as e:
             return {'success': False, 'error': f'Error ending investment: {str(e)}'}
 
+    def end_investments_bulk(self, investor_ids: List[str]) -> Dict[str, Any]:
+        """End several investments at once; the bulk form of end_investment.
+
+        Args:
+            investor_ids: The investor IDs
+
+        Returns:
+            Dict with success status, the inserted end_investment records and count
+        """
+        try:
+            if self.supabase is None:
+                return {'success': False, 'error': 'Supabase client not initialized'}
+            if not investor_ids:
+                return {'success': True, 'data': [], 'count': 0}
+
+            # Every investor update and end_investment record is written by one
+            # statement inside the database function
+            resp = self.supabase.rpc('end_investment_bulk', {'p_investor_ids': investor_ids}).execute()
+
+            outcome = getattr(resp, 'data', None)
+            if not isinstance(outcome, dict):
+                return {'success': False, 'error': 'Failed to end investments: unexpected response'}
+            if not outcome.get('success'):
+                return {'success': False, 'error': outcome.get('error')}
+
+            records = outcome.get('data') or []
+            self._invalidate_totals(*records)
+
+            for record in records:
+                notification = NotificationService.generate_investment_ended_notification(
+                    investor_id=record['investor_id'],
+                    returned_amount=record['amount_due']
+                )
+                _notify_pool.submit(_persist_notification, record['investor_id'], notification)
+
+            return {'success': True, 'data': records, 'count': outcome.get('count', len(records))}
+
+        except Exception as e:
+            return {'success': False, 'error': f'Error ending investments: {str(e)}'}
+
     def delete_transaction(self, transaction_id: str, investor_id: str) -> Dict[str, Any]:
         """Soft delete a transaction by marking it as deleted.
 
@@ -917,88 +1040,33 @@ class TransactionService:
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
-            # Verify transaction belongs to investor
-            check_resp = self.supabase.table('transactions').select('id').eq('transaction_id', transaction_id).eq('investor_id', investor_id).execute()
-            
-            data = None
-            if isinstance(check_resp, dict):
-                data = check_resp.get('data')
-            else:
-                data = getattr(check_resp, 'data', None)
-            
-            if not data:
-                return {'success': False, 'error': 'Transaction not found or access denied'}
-
-            # Perform soft delete (update is_deleted flag)
-            # Note: This assumes an 'is_deleted' column exists. 
-            # If not, we might need to add it or use a different strategy.
+            # Soft delete (is_deleted flag). Matching on investor_id as well makes the
+            # ownership check and the update one statement; no row back means the
+            # transaction doesn't exist or isn't this investor's
             update_data = {
                 'is_deleted': True,
-                'updated_at': datetime.utcnow().isoformat()
+                'updated_at': datetime.now(timezone.utc).isoformat()
             }
             
-            resp = self.supabase.table('transactions').update(update_data).eq('transaction_id', transaction_id).execute()
+            resp = self.supabase.table('transactions')\
+                .update(update_data)\
+                .eq('transaction_id', transaction_id)\
+                .eq('investor_id', investor_id)\
+                .execute()
 
-            error = None
-            if isinstance(resp, dict):
-                error = resp.get('error')
-            else:
-                error = getattr(resp, 'error', None)
+            data, error = self._unpack(resp)
 
             if error:
                 return {'success': False, 'error': f'Failed to delete transaction: {error}'}
+            if not data:
+                return {'success': False, 'error': 'Transaction not found or access denied'}
 
+            self._invalidate_totals({'account_number': data[0].get('account_number'), 'investor_id': investor_id})
             return {'success': True, 'message': 'Transaction deleted successfully'}
 
         except Exception as e:
             return {'success': False, 'error': f'Error deleting transaction: {str(e)}'}
 
-            transaction_error = None
-            if isinstance(transaction_resp, dict):
-                transaction_data = transaction_resp.get('data')
-                transaction_error = transaction_resp.get('error')
-            else:
-                transaction_data = getattr(transaction_resp, 'data', None)
-                transaction_error = getattr(transaction_resp, 'error', None)
-
-            if transaction_error:
-                return {'success': False, 'error': f'Failed to insert end investment transaction record: {transaction_error}'}
-            
-            result = {
-                'success': True,
-                'message': f'Investment ended successfully. {remaining_amount} transferred to spending account.',
-                'forfeiture_amount': forfeiture_amount,
-                'remaining_amount': remaining_amount
-            }
-
-            # Generate notification for investment ended and persist it
-            notification = NotificationService.generate_investment_ended_notification(
-                investor_id=investor_id,
-                returned_amount=remaining_amount
-            )
-            
-            # Persist the notification in the database
-            try:
-                from .notification_persistence_service import NotificationPersistenceService
-                notification_service = NotificationPersistenceService()
-                notification_service.create_notification(
-                    investor_id=investor_id,
-                    title=notification['title'],
-                    message=notification['message'],
-                    notification_type=notification['type'],
-                    event_type=notification['eventType'],
-                    metadata=notification.get('metadata')
-                )
-            except Exception as persist_error:
-                print(f"Failed to persist notification: {persist_error}")
-            
-            result['notification'] = notification
-
-            return result
-            
-        except Exception as e:
-            return {'success': False, 'error': f'Error ending investment: {str(e)}'}
-
     def renew_investment(self, investor_id: str) -> Dict[str, Any]:
         """Renew investment by clearing records but keeping initial deposits.
         Takes 20% of initial investment as service fee.
@@ -1013,98 +1081,20 @@ class TransactionService:
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
             
-            # Get investor details
-            investor_resp = self.supabase.table('investors').select('id, email, initial_investment, portfolio_type, investment_type, account_number').eq('id', investor_id).execute()
-            
-            data = None
-            error = None
-            if isinstance(investor_resp, dict):
-                data = investor_resp.get('data')
-                error = investor_resp.get('error')
-            else:
-                data = getattr(investor_resp, 'data', None)
-                error = getattr(investor_resp, 'error', None)
-            
-            if not data or len(data) == 0:
-                return {'success': False, 'error': f'Investor not found: {error}'}
+            # Investor lock, fee deduction, cycle reset and the renew_investment
+            # record happen in one round trip inside the database function
+            resp = self.supabase.rpc('renew_investment_tx', {'p_investor_id': investor_id}).execute()
 
-            investor = data[0]
-            initial_investment = float(investor.get('initial_investment', 0))
-            
-            # Calculate service fee (20% of initial investment)
-            service_fee = initial_investment * 0.20
-            remaining_amount = initial_investment - service_fee
-            
-            # Update investor record to reset investment details but keep initial deposit
-            update_data = {
-                'initial_investment': remaining_amount,  # Reduce initial investment by service fee
-                'total_investment': remaining_amount,    # Also update total_investment
-                'investment_type': None,  # Reset investment type
-                'investment_started': False,  # Reset investment started flag
-                'investment_ended': False,  # Reset investment ended flag
-                'payment_counter': 0,  # CRITICAL: Reset counter for new cycle
-                'current_week': 0,    # Reset week tracking
-                'total_paid': 0,      # Reset total paid for new cycle
-                'investment_start_date': None,  # Will be set on new investment selection
-                'last_due_date': None,
-                'next_due_date': None,
-                'investment_expiry_date': None,
-                'created_at': datetime.now().isoformat(),  # Reset creation date
-                'updated_at': datetime.now().isoformat()
-            }
-            
-            update_resp = self.supabase.table('investors').update(update_data).eq('id', investor_id).execute()
-            
-            update_data_result = None
-            update_error = None
-            if isinstance(update_resp, dict):
-                update_data_result = update_resp.get('data')
-                update_error = update_resp.get('error')
-            else:
-                update_data_result = getattr(update_resp, 'data', None)
-                update_error = getattr(update_resp, 'error', None)
-            
-            if update_error:
-                return {'success': False, 'error': f'Failed to update investor record: {update_error}'}
-            
-            # Record the renew investment transaction
-            transaction_record = {
-                'email': investor['email'],
-                'account_number': investor['account_number'],
-                'initial_balance': initial_investment,
-                'portfolio_type': investor['portfolio_type'],
-                'investment_type': investor.get('investment_type'),
-                'amount_due': 0,
-                'last_due_date': date.today().isoformat(),
-                'next_due_date': None,
-                'withdrawal_requested': False,
-                'withdraw_status': 'none',
-                'failure_reason': None,
-                'transaction_id': f"RENEW-{uuid.uuid4().hex[:12].upper()}",
-                'paystack_ref': None,
-                'paystack_status': 'completed',
-                'transaction_type': 'renew_investment',
-                'amount': remaining_amount,  # Amount available for new investment
-                'service_fee': service_fee,  # Record the service fee taken
-                'withdrawal_timestamp': datetime.now().isoformat(),
-                'paystack_timestamp': datetime.now().isoformat(),
-                'investor_id': investor_id
-            }
+            outcome = getattr(resp, 'data', None)
+            if not isinstance(outcome, dict):
+                return {'success': False, 'error': 'Failed to renew investment: unexpected response'}
+            if not outcome.get('success'):
+                return {'success': False, 'error': outcome.get('error')}
 
-            transaction_resp = self.supabase.table('transactions').insert(transaction_record).execute()
+            self._invalidate_totals(outcome['data'])
+            service_fee = outcome['service_fee']
+            remaining_amount = outcome['remaining_amount']
 
-            transaction_data = None
-            transaction_error = None
-            if isinstance(transaction_resp, dict):
-                transaction_data = transaction_resp.get('data')
-                transaction_error = transaction_resp.get('error')
-            else:
-                transaction_data = getattr(transaction_resp, 'data', None)
-                transaction_error = getattr(transaction_resp, 'error', None)
-
-            if transaction_error:
-                return {'success': False, 'error': f'Failed to insert renew investment transaction record: {transaction_error}'}
-            
             result = {
                 'success': True,
                 'message': f'Investment renewed successfully. Service fee of {service_fee} deducted. You can now select a new investment type.',
@@ -1117,20 +1107,8 @@ class TransactionService:
                 investor_id=investor_id
             )
             
-            # Persist the notification in the database
-            try:
-                from .notification_persistence_service import NotificationPersistenceService
-                notification_service = NotificationPersistenceService()
-                notification_service.create_notification(
-                    investor_id=investor_id,
-                    title=notification['title'],
-                    message=notification['message'],
-                    notification_type=notification['type'],
-                    event_type=notification['eventType'],
-                    metadata=notification.get('metadata')
-                )
-            except Exception as persist_error:
-                print(f"Failed to persist notification: {persist_error}")
+            # Persist the notification in the background; the response doesn't wait on it
+            _notify_pool.submit(_persist_notification, investor_id, notification)
             
             result['notification'] = notification
 
@@ -1139,6 +1117,71 @@ class TransactionService:
         except Exception as e:
             return {'success': False, 'error': f'Error renewing investment: {str(e)}'}
 
+    def renew_investments_bulk(self, investor_ids: List[str]) -> Dict[str, Any]:
+        """Renew several investments at once; the bulk form of renew_investment.
+
+        Args:
+            investor_ids: The investor IDs
+
+        Returns:
+            Dict with success status, the inserted renew_investment records and count
+        """
+        try:
+            if self.supabase is None:
+                return {'success': False, 'error': 'Supabase client not initialized'}
+            if not investor_ids:
+                return {'success': True, 'data': [], 'count': 0}
+
+            # Every fee deduction, cycle reset and renew_investment record is
+            # written by one statement inside the database function
+            resp = self.supabase.rpc('renew_investment_bulk', {'p_investor_ids': investor_ids}).execute()
+
+            outcome = getattr(resp, 'data', None)
+            if not isinstance(outcome, dict):
+                return {'success': False, 'error': 'Failed to renew investments: unexpected response'}
+            if not outcome.get('success'):
+                return {'success': False, 'error': outcome.get('error')}
+
+            records = outcome.get('data') or []
+            self._invalidate_totals(*records)
+
+            for record in records:
+                notification = NotificationService.generate_investment_renewed_notification(
+                    investor_id=record['investor_id']
+                )
+                _notify_pool.submit(_persist_notification, record['investor_id'], notification)
+
+            return {'success': True, 'data': records, 'count': outcome.get('count', len(records))}
+
+        except Exception as e:
+            return {'success': False, 'error': f'Error renewing investments: {str(e)}'}
+
+    @staticmethod
+    def _build_redemption_record(investor: Dict[str, Any], investor_id: str, amount: Any,
+                                 tx_id_suffix: str, now_iso: str) -> Dict[str, Any]:
+        """Build the points_redemption transaction row for an investor."""
+        return {
+            'email': investor['email'],
+            'account_number': investor['account_number'],
+            'initial_balance': 0,
+            'portfolio_type': investor['portfolio_type'],
+            'investment_type': investor.get('investment_type'),
+            'amount_due': -amount,  # Negative amount_due to indicate credit to spending account
+            'last_due_date': date.today().isoformat(),
+            'withdrawal_requested': False,
+            'withdraw_status': 'completed',
+            'failure_reason': None,
+            'transaction_id': f"REDEEM-{tx_id_suffix}",
+            'paystack_ref': None,
+            'paystack_status': 'completed',
+            'transaction_type': 'points_redemption',
+            'amount': amount,
+            'withdrawal_amount': amount,  # Store the cash amount here
+            'withdrawal_timestamp': now_iso,
+            'paystack_timestamp': now_iso,
+            'investor_id': investor_id
+        }
+
     def record_points_redemption_transaction(self, transaction_data: Dict[str, Any]) -> Dict[str, Any]:
         """Record a points redemption transaction that adds funds to spending account.
 
@@ -1165,60 +1208,79 @@ class TransactionService:
 
             investor_resp = self.supabase.table('investors').select('email, account_number, portfolio_type, investment_type').eq('id', investor_id).execute()
 
-            data = None
-            error = None
-            if isinstance(investor_resp, dict):
-                data = investor_resp.get('data')
-                error = investor_resp.get('error')
-            else:
-                data = getattr(investor_resp, 'data', None)
-                error = getattr(investor_resp, 'error', None)
+            data, error = self._unpack(investor_resp)
 
             if not data or len(data) == 0:
                 return {'success': False, 'error': f'Investor not found: {error}'}
 
             investor = data[0]
+            now_iso = datetime.now(timezone.utc).isoformat()
 
-            transaction_record = {
-                'email': investor['email'],
-                'account_number': investor['account_number'],
-                'initial_balance': 0,
-                'portfolio_type': investor['portfolio_type'],
-                'investment_type': investor.get('investment_type'),
-                'amount_due': -amount,  # Negative amount_due to indicate credit to spending account
-                'last_due_date': date.today().isoformat(),
-                'withdrawal_requested': False,
-                'withdraw_status': 'completed',
-                'failure_reason': None,
-                'transaction_id': f"REDEEM-{uuid.uuid4().hex[:12].upper()}",
-                'paystack_ref': None,
-                'paystack_status': 'completed',
-                'transaction_type': 'points_redemption',
-                'amount': amount,
-                'withdrawal_amount': str(amount),  # Store the cash amount here
-                'withdrawal_timestamp': datetime.now().isoformat(),
-                'paystack_timestamp': datetime.now().isoformat(),
-                'investor_id': investor_id
-            }
+            transaction_record = self._build_redemption_record(investor, investor_id, amount, _tx_id_suffix(), now_iso)
 
             if self.supabase is None:
                 return {'success': False, 'error': 'Supabase client not initialized'}
 
             resp = self.supabase.table('transactions').insert(transaction_record).execute()
 
-            data = None
-            error = None
-            if isinstance(resp, dict):
-                data = resp.get('data')
-                error = resp.get('error')
-            else:
-                data = getattr(resp, 'data', None)
-                error = getattr(resp, 'error', None)
+            data, error = self._unpack(resp)
 
             if data:
+                self._invalidate_totals(transaction_record)
                 return {'success': True, 'data': data[0] if isinstance(data, list) else data}
             else:
                 return {'success': False, 'error': f'Failed to record points redemption transaction: {error}'}
 
         except Exception as e:
             return {'success': False, 'error': f'Error recording points redemption transaction: {str(e)}'}
+
+    def record_points_redemptions_bulk(self, redemptions: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Record several points redemptions with one investor lookup and one insert.
+
+        Args:
+            redemptions: List of dicts each containing investor_id and amount
+
+        Returns:
+            Dict with success status, inserted records and count
+        """
+        try:
+            if self.supabase is None:
+                return {'success': False, 'error': 'Supabase client not initialized'}
+            if not redemptions:
+                return {'success': True, 'data': [], 'count': 0}
+
+            for redemption in redemptions:
+                for field in ('investor_id', 'amount'):
+                    if field not in redemption:
+                        return {'success': False, 'error': f'Missing required field: {field}'}
+
+            investor_ids = list({r['investor_id'] for r in redemptions})
+            investor_resp = self.supabase.table('investors').select(
+                'id, email, account_number, portfolio_type, investment_type'
+            ).in_('id', investor_ids).execute()
+
+            data, error = self._unpack(investor_resp)
+            investors = {row['id']: row for row in (data or [])}
+            missing = [i for i in investor_ids if i not in investors]
+            if missing:
+                return {'success': False, 'error': f'Investor not found: {", ".join(missing)}'}
+
+            now_iso = datetime.now(timezone.utc).isoformat()
+            suffixes = _tx_id_suffixes(len(redemptions))
+            records = [
+                self._build_redemption_record(investors[r['investor_id']], r['investor_id'], r['amount'], suffix, now_iso)
+                for r, suffix in zip(redemptions, suffixes)
+            ]
+
+            resp = self.supabase.table('transactions').insert(records).execute()
+
+            data, error = self._unpack(resp)
+
+            if data:
+                self._invalidate_totals(*records)
+                return {'success': True, 'data': data, 'count': len(data)}
+            else:
+                return {'success': False, 'error': f'Failed to record points redemption transactions: {error}'}
+
+        except Exception as e:
+            return {'success': False, 'error': f'Error recording points redemption transactions: {str(e)}'}
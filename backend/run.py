@@ -1,53 +1,235 @@
 import webview
 import threading
+from concurrent.futures import ThreadPoolExecutor
 import uvicorn
-import base64
 import os
+import sys
+import json
+import time
+try:
+    import pybase64 as base64  # SIMD decoder, same API as the stdlib module
+except ImportError:
+    import base64
 from app.main import app  # Import the FastAPI app
+from app.core import save_targets
+
+# Base64 characters decoded per step when writing a file; a multiple of 4 so
+# every chunk decodes on its own (256 KiB in, 192 KiB out)
+DECODE_CHUNK = 65536 * 4
+
+# Save dialogs and base64 writes run one at a time on this worker rather than
+# on the JS bridge thread that called in: back-to-back exports would otherwise
+# open overlapping dialogs, which can deadlock some backends (GTK). At most
+# MAX_PENDING_SAVES may be queued or running; further calls are turned away.
+MAX_PENDING_SAVES = 4
+_save_worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix='save-file')
+_save_slots = threading.BoundedSemaphore(MAX_PENDING_SAVES)
+
+def _run_serialized(fn, *args):
+    """Run fn on the save worker and wait for its result."""
+    if not _save_slots.acquire(blocking=False):
+        return {'success': False, 'error': 'Too many saves in progress'}
+    try:
+        return _save_worker.submit(fn, *args).result()
+    finally:
+        _save_slots.release()
+
+SAVE_FILE_TYPES = ('PDF Files (*.pdf)', 'All Files (*.*)')
+
+# Where the save dialog opens. Starting at '/' makes Windows enumerate the
+# drive root (slow on domain-joined machines), so open in Documents and then
+# in whichever folder the user last saved to, remembered across sessions.
+_APP_DIR = os.path.dirname(sys.executable if getattr(sys, 'frozen', False) else os.path.abspath(__file__))
+SAVE_DIR_FILE = os.path.join(_APP_DIR, 'save_dialog.json')
+
+def _default_save_dir():
+    documents = os.path.join(os.path.expanduser('~'), 'Documents')
+    return documents if os.path.isdir(documents) else os.getcwd()
+
+def _load_save_dir():
+    """Last folder saved to, or the default when unknown or gone."""
+    try:
+        with open(SAVE_DIR_FILE, 'r', encoding='utf-8') as f:
+            last_dir = json.load(f).get('last_dir')
+        if last_dir and os.path.isdir(last_dir):
+            return last_dir
+    except (OSError, ValueError, AttributeError):
+        pass
+    return _default_save_dir()
+
+def _store_save_dir(directory):
+    try:
+        with open(SAVE_DIR_FILE, 'w', encoding='utf-8') as f:
+            json.dump({'last_dir': directory}, f)
+    except OSError:
+        pass  # e.g. read-only install folder; only the next dialog's start folder is lost
+
+# Save-dialog mode, resolved once; pywebview 5+ replaced SAVE_DIALOG with FileDialog.SAVE
+_SAVE_MODE = webview.FileDialog.SAVE if hasattr(webview, 'FileDialog') else webview.SAVE_DIALOG
+
+# Maps the url-safe alphabet (-, _) onto the standard one (+, /)
+_URLSAFE_TABLE = bytes.maketrans(b'-_', b'+/')
+
+# Characters _strip_b64_ws removes; clean payloads (what btoa produces) are
+# detected with memchr-speed `in` tests and skip the strip copy
+_B64_WS = (b'\n', b'\r', b' ', b'\t')
+
+def _needs_strip(b):
+    """True if b carries a data: URI prefix or whitespace."""
+    return b.startswith(b'data:') or any(ws in b for ws in _B64_WS)
+
+def _strip_b64_ws(b):
+    """Drop a data: URI prefix and any whitespace/line breaks from base64 bytes."""
+    if b.startswith(b'data:'):
+        b = b.split(b',', 1)[-1]
+    return b.translate(None, b''.join(_B64_WS))
+
+def _write_base64(path, content_base64):
+    """Decode base64 content chunk by chunk straight into the file at path."""
+    # The JS bridge hands over a str; encode it once so each chunk is decoded
+    # from bytes instead of being re-encoded to ASCII inside b64decode
+    if isinstance(content_base64, str):
+        content_base64 = content_base64.encode('ascii')
+    # Chunks must be 4-character aligned, so wrapped or data-URI input is
+    # normalized first
+    if _needs_strip(content_base64):
+        content_base64 = _strip_b64_ws(content_base64)
+    # b64decode would silently drop url-safe characters; remap them, and
+    # restore the padding that url-safe encoders usually omit
+    if b'-' in content_base64 or b'_' in content_base64:
+        content_base64 = content_base64.translate(_URLSAFE_TABLE)
+    if len(content_base64) % 4:
+        content_base64 += b'=' * (-len(content_base64) % 4)
+    decoded_size = len(content_base64) // 4 * 3 - content_base64[-2:].count(b'=')
+
+    # Write next to the target and rename into place once complete, so virus
+    # scanners and other readers never see (and re-scan) a partial file
+    part_path = path + '.part'
+    fd = os.open(part_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        # Reserve the final size up front so the filesystem allocates the
+        # extents once instead of growing the file write by write
+        if decoded_size > 0 and hasattr(os, 'posix_fallocate'):
+            try:
+                os.posix_fallocate(fd, 0, decoded_size)
+            except OSError:
+                pass  # not supported on this filesystem; plain writes still work
+        written = 0
+        for i in range(0, len(content_base64), DECODE_CHUNK):
+            view = memoryview(base64.b64decode(content_base64[i:i + DECODE_CHUNK], validate=False))
+            while view:
+                n = os.write(fd, view)
+                written += n
+                view = view[n:]
+        # The reservation extends the file; trim it if the estimate was off
+        if written != decoded_size:
+            os.ftruncate(fd, written)
+    except BaseException:
+        os.close(fd)
+        os.remove(part_path)
+        raise
+    os.close(fd)
+    os.replace(part_path, path)
 
 class JsApi:
+    def __init__(self):
+        # Bound create_file_dialog of the app window, looked up on first save
+        # (the window does not exist yet when the API object is built)
+        self._create_dialog = None
+        self._save_dir = _load_save_dir()
+
+    def _ask_save_path(self, filename):
+        """Show the native save dialog; returns the chosen path or None."""
+        if self._create_dialog is None:
+            self._create_dialog = webview.windows[0].create_file_dialog
+
+        save_path = self._create_dialog(
+            _SAVE_MODE, 
+            directory=self._save_dir, 
+            save_filename=filename,
+            file_types=SAVE_FILE_TYPES
+        )
+
+        # save_path is typically a string, but sometimes a tuple/list depending on OS/version, handle carefully
+        if isinstance(save_path, (list, tuple)):
+            save_path = save_path[0] if save_path else None
+        if save_path:
+            save_dir = os.path.dirname(save_path)
+            if save_dir and save_dir != self._save_dir:
+                self._save_dir = save_dir
+                _store_save_dir(save_dir)
+        return save_path or None
+
+    def choose_save_path(self, filename):
+        """Ask where to save; the page then POSTs the raw bytes to upload_url."""
+        return _run_serialized(self._choose_save_path, filename)
+
     def save_file(self, filename, content_base64):
+        """Base64 variant of choose_save_path + upload, kept for older pages."""
+        return _run_serialized(self._save_file, filename, content_base64)
+
+    def _choose_save_path(self, filename):
+        try:
+            save_path = self._ask_save_path(filename)
+            if save_path:
+                token = save_targets.register(save_path)
+                return {'success': True, 'path': save_path, 'upload_url': f'/save-pdf/{token}'}
+            return {'success': False, 'reason': 'cancelled'}
+        except Exception as e:
+            return {'success': False, 'error': str(e)}
+
+    def _save_file(self, filename, content_base64):
         try:
-            # Decode base64 content
-            content = base64.b64decode(content_base64)
-            
-            # Open save dialog
-            file_types = ('PDF Files (*.pdf)', 'All Files (*.*)')
-            # Handle deprecation of SAVE_DIALOG in newer pywebview versions
-            dialog_type = getattr(webview, 'FileDialog', None)
-            save_mode = dialog_type.SAVE if dialog_type else webview.SAVE_DIALOG
-            
-            save_path = webview.windows[0].create_file_dialog(
-                save_mode, 
-                directory='/', 
-                save_filename=filename,
-                file_types=file_types
-            )
-            
+            save_path = self._ask_save_path(filename)
             if save_path:
-                # If user selected a path, write the file
-                # save_path is typically a string, but sometimes a tuple/list depending on OS/version, handle carefully
-                if isinstance(save_path, (list, tuple)):
-                    save_path = save_path[0]
-                    
-                with open(save_path, 'wb') as f:
-                    f.write(content)
+                # Decode while writing so the whole PDF is never held in memory
+                _write_base64(save_path, content_base64)
                 return {'success': True, 'path': save_path}
             return {'success': False, 'reason': 'cancelled'}
         except Exception as e:
             return {'success': False, 'error': str(e)}
 
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8000  # Use port 8000 to match main.py
+STARTUP_TIMEOUT = 5.0
+SHUTDOWN_TIMEOUT = 5.0
+
+# loop="auto" picks uvloop where it is installed (not on Windows) and falls
+# back to asyncio; httptools replaces the pure-Python h11 parser. The only
+# client is the embedded window, so skip access logging and keep its
+# connections open between requests. Holding the Server object (rather than
+# calling uvicorn.run) lets the main thread see when it is listening and ask
+# it to shut down cleanly when the window closes.
+server = uvicorn.Server(uvicorn.Config(
+    app, host=SERVER_HOST, port=SERVER_PORT, log_level="warning",
+    loop="auto", http="httptools", access_log=False, timeout_keep_alive=30,
+))
+
+# Set by the app's startup hook once the lifespan (scheduler etc.) has run;
+# uvicorn binds the socket right after and then flips server.started
+server_started = threading.Event()
+app.add_event_handler("startup", server_started.set)
+
+def wait_for_server(timeout=STARTUP_TIMEOUT):
+    """Block until the embedded server is listening or timeout passes."""
+    deadline = time.monotonic() + timeout
+    server_started.wait(timeout)
+    while not server.started:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
 def start_server():
-    uvicorn.run(app, host="127.0.0.1", port=8000, log_level="warning")  # Use port 8000 to match main.py
+    server.run()
 
 if __name__ == "__main__":
     # Start FastAPI server in a background thread
     server_thread = threading.Thread(target=start_server, daemon=True)
     server_thread.start()
 
-    # Wait a moment for server to start
-    import time
-    time.sleep(1)
+    # Open the window as soon as the server is listening rather than after a fixed delay
+    wait_for_server()
 
     # Initialize API
     js_api = JsApi()
@@ -55,11 +237,15 @@ if __name__ == "__main__":
     # Open PyWebView window pointing to the root URL which serves index.html
     webview.create_window(
         'Blue Gold Investment',
-        'http://127.0.0.1:8000/',  # Point to root URL where index.html is served
+        f'http://{SERVER_HOST}:{SERVER_PORT}/',  # Point to root URL where index.html is served
         width=1400,
         height=900,
         resizable=True,
         fullscreen=False,
         js_api=js_api
     )
-    webview.start()
\ No newline at end of file
+    webview.start()
+
+    # The window is closed; let the server run its shutdown hooks (scheduler)
+    server.should_exit = True
+    server_thread.join(SHUTDOWN_TIMEOUT)
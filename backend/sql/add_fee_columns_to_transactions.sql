@@ -0,0 +1,10 @@
+-- Script to add the forfeiture_amount and service_fee columns to the transactions table
+-- Both are written by the end/renew investment functions, which compute them as numeric;
+-- make sure they are stored as numeric(15,2) like the other amount columns
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS forfeiture_amount numeric(15,2) DEFAULT 0,
+ADD COLUMN IF NOT EXISTS service_fee numeric(15,2) DEFAULT 0;
+
+ALTER TABLE transactions
+ALTER COLUMN forfeiture_amount TYPE numeric(15,2) USING forfeiture_amount::numeric(15,2),
+ALTER COLUMN service_fee TYPE numeric(15,2) USING service_fee::numeric(15,2);
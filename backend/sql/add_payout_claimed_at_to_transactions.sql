@@ -0,0 +1,5 @@
+-- Script to add payout_claimed_at column to transactions table
+-- Set by claim_withdrawal when a payout starts, so an admin-approved
+-- ('processing') withdrawal can be paid out exactly once
+ALTER TABLE transactions
+ADD COLUMN IF NOT EXISTS payout_claimed_at timestamptz;
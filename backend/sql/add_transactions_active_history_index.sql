@@ -0,0 +1,7 @@
+-- Partial index for transaction history: an investor's non-deleted
+-- transactions, newest first. Matches the is_deleted IS NOT TRUE filter and
+-- created_at DESC ordering used by TransactionService.get_transaction_history,
+-- so a page of history is read straight off the index.
+CREATE INDEX IF NOT EXISTS idx_tx_active
+  ON transactions (investor_id, created_at DESC)
+  WHERE is_deleted IS NOT TRUE;
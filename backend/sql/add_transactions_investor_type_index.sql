@@ -0,0 +1,7 @@
+-- Composite index for per-investor lookups by transaction type, newest first
+-- (history filtered by type, withdrawals and interest deposits per investor).
+-- Lookups by transaction_id are already covered by the UNIQUE constraint's
+-- index on transactions.transaction_id.
+CREATE INDEX IF NOT EXISTS idx_tx_investor_type
+  ON transactions (investor_id, transaction_type, created_at DESC)
+  WHERE is_deleted IS NOT TRUE;
@@ -0,0 +1,107 @@
+-- Running balance per account, kept up to date by a trigger on transactions.
+-- Read by TransactionService.get_account_balance as a single-row lookup
+-- instead of summing the account's history on every call.
+--
+-- Each transaction contributes the same amount as in compute_account_balance:
+-- initial/payment add, sent withdrawals subtract, end_investment adds
+-- amount - 2 * forfeiture_amount, and soft-deleted rows count for nothing.
+-- The trigger applies the difference between the old and new contribution.
+
+CREATE TABLE IF NOT EXISTS account_balances (
+  account_number text PRIMARY KEY,
+  balance numeric NOT NULL DEFAULT 0,
+  updated_at timestamptz DEFAULT now()
+);
+
+CREATE OR REPLACE FUNCTION public.transaction_balance_delta(
+  p_transaction_type text,
+  p_amount numeric,
+  p_withdraw_status text,
+  p_forfeiture_amount numeric,
+  p_is_deleted boolean
+)
+RETURNS numeric
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT CASE
+    WHEN p_is_deleted IS TRUE THEN 0
+    WHEN p_transaction_type IN ('initial', 'payment') THEN COALESCE(p_amount, 0)
+    WHEN p_transaction_type = 'withdrawal' AND p_withdraw_status = 'sent' THEN -COALESCE(p_amount, 0)
+    WHEN p_transaction_type = 'end_investment' THEN COALESCE(p_amount, 0) - 2 * COALESCE(p_forfeiture_amount, 0)
+    ELSE 0
+  END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.apply_account_balance_delta()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_old numeric := 0;
+  v_new numeric := 0;
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    v_old := transaction_balance_delta(OLD.transaction_type, OLD.amount, OLD.withdraw_status, OLD.forfeiture_amount, OLD.is_deleted);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    v_new := transaction_balance_delta(NEW.transaction_type, NEW.amount, NEW.withdraw_status, NEW.forfeiture_amount, NEW.is_deleted);
+  END IF;
+
+  IF TG_OP = 'UPDATE' AND OLD.account_number IS NOT DISTINCT FROM NEW.account_number THEN
+    v_new := v_new - v_old;
+    v_old := 0;
+  END IF;
+
+  IF v_old <> 0 THEN
+    INSERT INTO account_balances (account_number, balance)
+    VALUES (OLD.account_number, -v_old)
+    ON CONFLICT (account_number) DO UPDATE
+    SET balance = account_balances.balance + EXCLUDED.balance, updated_at = now();
+  END IF;
+
+  IF v_new <> 0 THEN
+    INSERT INTO account_balances (account_number, balance)
+    VALUES (NEW.account_number, v_new)
+    ON CONFLICT (account_number) DO UPDATE
+    SET balance = account_balances.balance + EXCLUDED.balance, updated_at = now();
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trg_transactions_account_balance ON transactions;
+CREATE TRIGGER trg_transactions_account_balance
+AFTER INSERT OR DELETE OR UPDATE OF account_number, transaction_type, amount, withdraw_status, forfeiture_amount, is_deleted
+ON transactions
+FOR EACH ROW
+EXECUTE PROCEDURE apply_account_balance_delta();
+
+-- Recompute every account's balance from its full history in one set-based
+-- pass. Used for the initial backfill and for back-office reconciliation
+-- (e.g. after bulk data fixes made with the trigger disabled). Returns the
+-- number of accounts written.
+CREATE OR REPLACE FUNCTION public.rebuild_account_balances()
+RETURNS integer
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_count integer;
+BEGIN
+  INSERT INTO account_balances (account_number, balance)
+  SELECT account_number,
+         SUM(transaction_balance_delta(transaction_type, amount, withdraw_status, forfeiture_amount, is_deleted))
+  FROM transactions
+  GROUP BY account_number
+  ON CONFLICT (account_number) DO UPDATE SET balance = EXCLUDED.balance, updated_at = now();
+
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$;
+
+-- Backfill from existing history
+SELECT rebuild_account_balances();
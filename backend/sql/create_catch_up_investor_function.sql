@@ -0,0 +1,97 @@
+-- Pay every missed interest installment for an investor in a single round trip.
+-- Called by InterestCalculationService.admin_catch_up_missed_payments via
+-- supabase.rpc('catch_up_investor', ...).
+--
+-- Runs in one transaction: locks the investor row, works out how many weeks
+-- have elapsed beyond payment_counter, records one interest_deposit per missed
+-- week, credits the spending account for the weeks actually recorded and
+-- brings payment_counter up to date. Transaction IDs are deterministic
+-- (INT-<investor id>-W<week>), so weeks already recorded are skipped rather
+-- than paid twice. The weekly rate is passed in because the portfolio rules
+-- live in PortfolioService.
+
+CREATE OR REPLACE FUNCTION public.catch_up_investor(
+  p_investor_id uuid,
+  p_weekly_rate numeric
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_investor investors%ROWTYPE;
+  v_principal numeric;
+  v_interest numeric;
+  v_weeks_elapsed integer;
+  v_counter integer;
+  v_claimed integer;
+  v_total numeric;
+  v_balance numeric;
+BEGIN
+  SELECT * INTO v_investor FROM investors WHERE id = p_investor_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN jsonb_build_object('success', false, 'error', 'Investor not found');
+  END IF;
+
+  -- Fallback to initial_investment if total_investment is 0 or missing (legacy data)
+  v_principal := COALESCE(NULLIF(v_investor.total_investment, 0), v_investor.initial_investment, 0);
+  v_counter := COALESCE(v_investor.payment_counter, 0);
+
+  IF v_investor.investment_type IS NULL OR v_investor.investment_start_date IS NULL OR v_principal <= 0 THEN
+    v_weeks_elapsed := 0;
+  ELSE
+    v_weeks_elapsed := floor(extract(epoch FROM now() - v_investor.investment_start_date) / 604800)::integer;
+  END IF;
+
+  IF v_weeks_elapsed <= v_counter THEN
+    RETURN jsonb_build_object('success', true, 'processed_count', 0, 'message', 'No missed payments to catch up');
+  END IF;
+
+  v_interest := v_principal * p_weekly_rate;
+  IF v_interest <= 0 THEN
+    RETURN jsonb_build_object('success', true, 'processed_count', 0, 'message', 'No interest to withdraw');
+  END IF;
+
+  -- Claim each missed week; weeks recorded by an earlier run are skipped
+  INSERT INTO transactions (
+    investor_id, amount, transaction_type, transaction_id, email,
+    account_number, portfolio_type, investment_type, withdraw_status
+  )
+  SELECT
+    p_investor_id, v_interest, 'interest_deposit', 'INT-' || p_investor_id || '-W' || week, v_investor.email,
+    v_investor.account_number, v_investor.portfolio_type, v_investor.investment_type, 'completed'
+  FROM generate_series(v_counter + 1, v_weeks_elapsed) AS week
+  ON CONFLICT (transaction_id) DO NOTHING;
+
+  GET DIAGNOSTICS v_claimed = ROW_COUNT;
+  v_total := v_interest * v_claimed;
+
+  IF v_claimed > 0 THEN
+    -- Credit the spending account, creating it on first payout
+    UPDATE spending_accounts
+    SET balance = COALESCE(balance, 0) + v_total
+    WHERE investor_id = p_investor_id
+    RETURNING balance INTO v_balance;
+
+    IF NOT FOUND THEN
+      INSERT INTO spending_accounts (investor_id, balance, total_withdrawn)
+      VALUES (p_investor_id, v_total, 0)
+      RETURNING balance INTO v_balance;
+    END IF;
+  END IF;
+
+  UPDATE investors
+  SET total_paid = COALESCE(total_paid, 0) + v_total,
+      payment_counter = v_weeks_elapsed,
+      updated_at = now()
+  WHERE id = p_investor_id;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'processed_count', v_claimed,
+    'interest_deposited', v_total,
+    'new_balance', v_balance,
+    'message', 'Processed ' || v_claimed || ' missed payments'
+  );
+END;
+$$;
@@ -0,0 +1,44 @@
+-- Missed-payment arithmetic for one investor, or every investor when
+-- p_investor_id is NULL. Called by InterestCalculationService via
+-- supabase.rpc('catch_up_plan', ...).
+--
+-- weeks_elapsed follows the same rule as pay_investor_interest and
+-- catch_up_investor: full weeks since investment_start_date, or 0 when the
+-- investor has no investment type, start date or principal.
+
+CREATE OR REPLACE FUNCTION public.catch_up_plan(
+  p_investor_id uuid DEFAULT NULL
+)
+RETURNS TABLE (
+  investor_id uuid,
+  weeks_elapsed integer,
+  payment_counter integer,
+  missed_count integer,
+  next_due_date date
+)
+LANGUAGE sql
+STABLE
+SET search_path = public, pg_temp
+AS $$
+  SELECT
+    p.id,
+    p.weeks_elapsed,
+    p.payment_counter,
+    p.weeks_elapsed - p.payment_counter,
+    p.next_due_date
+  FROM (
+    SELECT
+      i.id,
+      CASE
+        WHEN i.investment_type IS NULL
+          OR i.investment_start_date IS NULL
+          OR COALESCE(NULLIF(i.total_investment, 0), i.initial_investment, 0) <= 0
+        THEN 0
+        ELSE floor(extract(epoch FROM now() - i.investment_start_date) / 604800)::integer
+      END AS weeks_elapsed,
+      COALESCE(i.payment_counter, 0) AS payment_counter,
+      i.next_due_date
+    FROM investors i
+    WHERE p_investor_id IS NULL OR i.id = p_investor_id
+  ) p;
+$$;
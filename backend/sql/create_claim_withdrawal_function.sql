@@ -0,0 +1,70 @@
+-- Claim a withdrawal for payout in a single round trip.
+-- Called by TransactionService._prepare_payout via
+-- supabase.rpc('claim_withdrawal', ...).
+--
+-- Claims a pending or admin-approved ('processing') withdrawal by stamping
+-- payout_claimed_at in one conditional UPDATE, so the check and the claim
+-- cannot race: of two concurrent callers only one finds the row unclaimed.
+-- The approval status itself is left to mean "approved", not "being paid".
+-- Payouts that fail before or definitively at the transfer release the
+-- claim (or fail the withdrawal); a claim whose payout died without a known
+-- outcome can be taken again only once it is older than p_stale_after; the transfer reference is derived from the
+-- transaction ID, so Paystack rejects a second transfer for the same claim.
+-- Returns the amount together with the investor's bank details.
+
+DROP FUNCTION IF EXISTS public.claim_withdrawal(text);
+
+CREATE OR REPLACE FUNCTION public.claim_withdrawal(
+  p_transaction_id text,
+  p_stale_after interval DEFAULT interval '15 minutes'
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_tx transactions%ROWTYPE;
+  v_investor investors%ROWTYPE;
+  v_status text;
+BEGIN
+  UPDATE transactions
+  SET withdraw_status = 'processing',
+      payout_claimed_at = now(),
+      updated_at = now()
+  WHERE transaction_id = p_transaction_id
+    AND withdraw_status IN ('pending', 'processing')
+    AND (payout_claimed_at IS NULL OR payout_claimed_at < now() - p_stale_after)
+  RETURNING * INTO v_tx;
+
+  IF NOT FOUND THEN
+    SELECT withdraw_status INTO v_status FROM transactions WHERE transaction_id = p_transaction_id;
+    IF NOT FOUND THEN
+      RETURN jsonb_build_object('success', false, 'error', 'Transaction not found');
+    END IF;
+    IF v_status IN ('pending', 'processing') THEN
+      RETURN jsonb_build_object('success', false, 'error', 'Payout already in progress');
+    END IF;
+    RETURN jsonb_build_object('success', false, 'error', 'Invalid status for payout: ' || COALESCE(v_status, 'none'));
+  END IF;
+
+  SELECT * INTO v_investor FROM investors WHERE id = v_tx.investor_id;
+  IF NOT FOUND THEN
+    -- Nothing was sent; release the claim so the payout can be retried
+    UPDATE transactions SET payout_claimed_at = NULL WHERE id = v_tx.id;
+    RETURN jsonb_build_object('success', false, 'error', 'Investor details not found');
+  END IF;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'data', jsonb_build_object(
+      'transaction_id', v_tx.transaction_id,
+      'amount', v_tx.amount,
+      'investor_id', v_tx.investor_id,
+      'bank_name', v_investor.bank_name,
+      'bank_account_number', v_investor.bank_account_number,
+      'bank_account_name', v_investor.bank_account_name,
+      'email', v_investor.email
+    )
+  );
+END;
+$$;
@@ -0,0 +1,35 @@
+-- Current balance of an account, summed in the database.
+-- Called by TransactionService.get_account_balance via
+-- supabase.rpc('compute_account_balance', ...).
+--
+-- Initial investments and payments add to the balance, sent withdrawals
+-- subtract from it, and an end_investment adds what was moved to the
+-- spending account less the forfeiture (amount - 2 * forfeiture_amount).
+-- Soft-deleted transactions are ignored.
+
+CREATE OR REPLACE FUNCTION public.compute_account_balance(
+  p_account_number text
+)
+RETURNS numeric
+LANGUAGE sql
+STABLE
+SET search_path = public, pg_temp
+AS $$
+  SELECT COALESCE(SUM(
+    CASE
+      WHEN transaction_type IN ('initial', 'payment') THEN amount
+      WHEN transaction_type = 'withdrawal' AND withdraw_status = 'sent' THEN -amount
+      WHEN transaction_type = 'end_investment' THEN amount - 2 * COALESCE(forfeiture_amount, 0)
+      ELSE 0
+    END
+  ), 0)
+  FROM transactions
+  WHERE account_number = p_account_number
+    AND is_deleted IS NOT TRUE;
+$$;
+
+-- Covering index so the aggregate is answered from the index alone
+CREATE INDEX IF NOT EXISTS idx_tx_account_balance
+  ON transactions (account_number)
+  INCLUDE (transaction_type, amount, withdraw_status, forfeiture_amount)
+  WHERE is_deleted IS NOT TRUE;
@@ -0,0 +1,58 @@
+-- End several investors' investments in a single round trip.
+-- Called by TransactionService.end_investments_bulk via
+-- supabase.rpc('end_investment_bulk', ...).
+--
+-- Set-based counterpart of end_investment_tx: locks the investor rows, marks
+-- every investment ended and records one end_investment transaction per
+-- investor in one statement. 25% of each initial investment is forfeited and
+-- the remaining 75% goes to the spending account. Unknown IDs are skipped.
+-- Returns the inserted transaction rows.
+
+CREATE OR REPLACE FUNCTION public.end_investment_bulk(
+  p_investor_ids uuid[]
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_rows jsonb;
+BEGIN
+  WITH old AS (
+    SELECT id, email, account_number, portfolio_type, investment_type,
+           COALESCE(initial_investment, 0) AS initial
+    FROM investors
+    WHERE id = ANY(p_investor_ids)
+    FOR UPDATE
+  ), upd AS (
+    UPDATE investors i
+    SET investment_ended = true,
+        ended_at = now(),
+        updated_at = now()
+    FROM old
+    WHERE i.id = old.id
+    RETURNING old.*
+  ), ins AS (
+    INSERT INTO transactions (
+      email, account_number, initial_balance, portfolio_type, investment_type,
+      amount_due, last_due_date, next_due_date, withdrawal_requested, withdraw_status,
+      failure_reason, transaction_id, paystack_ref, paystack_status, transaction_type,
+      amount, forfeiture_amount, withdrawal_timestamp, paystack_timestamp, investor_id
+    )
+    SELECT
+      email, account_number, initial, portfolio_type, investment_type,
+      initial - initial * 0.25, current_date, NULL, false, 'completed',
+      NULL, 'END-' || upper(substr(replace(gen_random_uuid()::text, '-', ''), 1, 12)), NULL, 'completed', 'end_investment',
+      initial, initial * 0.25, now(), now(), id
+    FROM upd
+    RETURNING *
+  )
+  SELECT COALESCE(jsonb_agg(to_jsonb(ins)), '[]'::jsonb) INTO v_rows FROM ins;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'data', v_rows,
+    'count', jsonb_array_length(v_rows)
+  );
+END;
+$$;
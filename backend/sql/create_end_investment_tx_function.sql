@@ -0,0 +1,61 @@
+-- End an investor's investment in a single round trip.
+-- Called by TransactionService.end_investment via
+-- supabase.rpc('end_investment_tx', ...).
+--
+-- Locks the investor row, marks the investment ended and records the
+-- end_investment transaction in one database transaction: 25% of the initial
+-- investment is forfeited and the remaining 75% goes to the spending account.
+-- The END-<hex> transaction ID is generated here. Returns the inserted
+-- transaction row with the forfeiture and remaining amounts.
+
+DROP FUNCTION IF EXISTS public.end_investment_tx(uuid, text);
+
+CREATE OR REPLACE FUNCTION public.end_investment_tx(
+  p_investor_id uuid
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_investor investors%ROWTYPE;
+  v_initial numeric;
+  v_forfeiture numeric;
+  v_tx transactions%ROWTYPE;
+BEGIN
+  SELECT * INTO v_investor FROM investors WHERE id = p_investor_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN jsonb_build_object('success', false, 'error', 'Investor not found');
+  END IF;
+
+  v_initial := COALESCE(v_investor.initial_investment, 0);
+  v_forfeiture := v_initial * 0.25;
+
+  UPDATE investors
+  SET investment_ended = true,
+      ended_at = now(),
+      updated_at = now()
+  WHERE id = p_investor_id;
+
+  INSERT INTO transactions (
+    email, account_number, initial_balance, portfolio_type, investment_type,
+    amount_due, last_due_date, next_due_date, withdrawal_requested, withdraw_status,
+    failure_reason, transaction_id, paystack_ref, paystack_status, transaction_type,
+    amount, forfeiture_amount, withdrawal_timestamp, paystack_timestamp, investor_id
+  )
+  VALUES (
+    v_investor.email, v_investor.account_number, v_initial, v_investor.portfolio_type, v_investor.investment_type,
+    v_initial - v_forfeiture, current_date, NULL, false, 'completed',
+    NULL, 'END-' || upper(substr(replace(gen_random_uuid()::text, '-', ''), 1, 12)), NULL, 'completed', 'end_investment',
+    v_initial, v_forfeiture, now(), now(), p_investor_id
+  )
+  RETURNING * INTO v_tx;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'data', to_jsonb(v_tx),
+    'forfeiture_amount', v_forfeiture,
+    'remaining_amount', v_initial - v_forfeiture
+  );
+END;
+$$;
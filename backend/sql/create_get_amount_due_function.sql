@@ -0,0 +1,23 @@
+-- Total interest due to an investor, summed in the database.
+-- Called by DashboardService.get_total_amount_due via
+-- supabase.rpc('get_amount_due', ...).
+--
+-- Counts amount_due on transactions that have not been withdrawn yet,
+-- excluding end_investment and renew_investment records. Returns 0 when the
+-- investor has nothing due.
+
+CREATE OR REPLACE FUNCTION public.get_amount_due(
+  p_investor_id uuid
+)
+RETURNS numeric
+LANGUAGE sql
+STABLE
+SET search_path = public, pg_temp
+AS $$
+  SELECT COALESCE(SUM(amount_due), 0)
+  FROM transactions
+  WHERE investor_id = p_investor_id
+    AND amount_due > 0
+    AND withdrawal_requested = false
+    AND transaction_type NOT IN ('end_investment', 'renew_investment');
+$$;
@@ -0,0 +1,48 @@
+-- Record a Paystack payment against its investor in a single round trip.
+-- Called by TransactionService.record_paystack_transaction via
+-- supabase.rpc('insert_paystack_tx_with_investor', ...).
+--
+-- The investor is matched by p_investor_id when given, otherwise by email,
+-- and its account/portfolio details are copied into the new row by the same
+-- INSERT ... SELECT. Returns the inserted row.
+
+CREATE OR REPLACE FUNCTION public.insert_paystack_tx_with_investor(
+  p_transaction_id text,
+  p_reference text,
+  p_amount numeric,
+  p_status text,
+  p_paystack_timestamp timestamptz,
+  p_email text DEFAULT NULL,
+  p_investor_id uuid DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_tx transactions%ROWTYPE;
+BEGIN
+  INSERT INTO transactions (
+    email, account_number, initial_balance, portfolio_type, investment_type,
+    amount_due, withdrawal_requested, withdraw_status, transaction_id,
+    paystack_ref, paystack_status, transaction_type, amount, paystack_timestamp,
+    investor_id
+  )
+  SELECT
+    i.email, i.account_number, 0, i.portfolio_type, i.investment_type,
+    0, false, 'none', p_transaction_id,
+    p_reference, p_status, 'payment', p_amount, p_paystack_timestamp,
+    i.id
+  FROM investors i
+  WHERE (p_investor_id IS NOT NULL AND i.id = p_investor_id)
+     OR (p_investor_id IS NULL AND i.email = p_email)
+  LIMIT 1
+  RETURNING * INTO v_tx;
+
+  IF NOT FOUND THEN
+    RETURN jsonb_build_object('success', false, 'error', 'Investor not found');
+  END IF;
+
+  RETURN jsonb_build_object('success', true, 'data', to_jsonb(v_tx));
+END;
+$$;
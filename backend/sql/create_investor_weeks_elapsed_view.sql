@@ -0,0 +1,23 @@
+-- Investor fields needed for amount-due calculations, with whole weeks elapsed
+-- since created_at computed in the database. Read by the /portfolio/amount-due
+-- route and TransactionService.update_transaction_amounts so they do not parse
+-- timestamps in Python.
+--
+-- weeks_elapsed matches the Python rule it replaces: (now - created_at).days // 7.
+-- It is a view rather than a generated column because it depends on now().
+
+CREATE OR REPLACE VIEW investor_weeks_elapsed
+WITH (security_invoker = true)
+AS
+SELECT
+  i.id,
+  i.email,
+  i.portfolio_type,
+  i.investment_type,
+  i.initial_investment,
+  i.created_at,
+  CASE
+    WHEN i.created_at IS NULL THEN 0
+    ELSE floor(extract(epoch FROM now() - i.created_at) / 604800)::integer
+  END AS weeks_elapsed
+FROM investors i;
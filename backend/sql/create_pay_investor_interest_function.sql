@@ -0,0 +1,112 @@
+-- Pay one week of interest to an investor in a single round trip.
+-- Called by InterestCalculationService.process_investor_due_date_check via
+-- supabase.rpc('pay_investor_interest', ...).
+--
+-- Runs in one transaction: locks the investor row, skips if interest was
+-- already deposited today or the payment counter has caught up with the
+-- weeks elapsed, credits the spending account, advances the due dates and
+-- records the interest_deposit transaction. The weekly rate and expiry date
+-- are passed in because the portfolio rules live in PortfolioService.
+
+CREATE OR REPLACE FUNCTION public.pay_investor_interest(
+  p_investor_id uuid,
+  p_weekly_rate numeric,
+  p_expiry_date date DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_investor investors%ROWTYPE;
+  v_principal numeric;
+  v_interest numeric;
+  v_weeks_elapsed integer;
+  v_counter integer;
+  v_balance numeric;
+  v_next_due date;
+  v_transaction_id text;
+BEGIN
+  SELECT * INTO v_investor FROM investors WHERE id = p_investor_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN jsonb_build_object('success', false, 'error', 'Investor not found');
+  END IF;
+
+  -- Idempotency: at most one interest deposit per investor per day
+  IF EXISTS (
+    SELECT 1 FROM transactions
+    WHERE investor_id = p_investor_id
+      AND transaction_type = 'interest_deposit'
+      AND created_at >= date_trunc('day', now())
+  ) THEN
+    RETURN jsonb_build_object('success', true, 'paid', false, 'message', 'Interest already paid today');
+  END IF;
+
+  -- Fallback to initial_investment if total_investment is 0 or missing (legacy data)
+  v_principal := COALESCE(NULLIF(v_investor.total_investment, 0), v_investor.initial_investment, 0);
+  v_counter := COALESCE(v_investor.payment_counter, 0);
+
+  IF v_investor.investment_type IS NULL OR v_investor.investment_start_date IS NULL OR v_principal <= 0 THEN
+    v_weeks_elapsed := 0;
+  ELSE
+    v_weeks_elapsed := floor(extract(epoch FROM now() - v_investor.investment_start_date) / 604800)::integer;
+  END IF;
+
+  IF v_weeks_elapsed <= v_counter THEN
+    RETURN jsonb_build_object('success', true, 'paid', false, 'message', 'Payment not yet due based on counter');
+  END IF;
+
+  v_interest := v_principal * p_weekly_rate;
+  IF v_interest <= 0 THEN
+    RETURN jsonb_build_object('success', true, 'paid', false, 'message', 'No interest to withdraw');
+  END IF;
+
+  -- Credit the spending account, creating it on first payout
+  UPDATE spending_accounts
+  SET balance = COALESCE(balance, 0) + v_interest
+  WHERE investor_id = p_investor_id
+  RETURNING balance INTO v_balance;
+
+  IF NOT FOUND THEN
+    INSERT INTO spending_accounts (investor_id, balance, total_withdrawn)
+    VALUES (p_investor_id, v_interest, 0)
+    RETURNING balance INTO v_balance;
+  END IF;
+
+  -- Advance to the next week; stop scheduling once past expiry
+  v_next_due := v_investor.next_due_date + 7;
+  IF p_expiry_date IS NOT NULL AND v_next_due > p_expiry_date THEN
+    v_next_due := NULL;
+  END IF;
+
+  UPDATE investors
+  SET total_paid = COALESCE(total_paid, 0) + v_interest,
+      payment_counter = v_counter + 1,
+      last_due_date = v_investor.next_due_date,
+      next_due_date = v_next_due,
+      current_week = COALESCE(current_week, 0) + 1,
+      updated_at = now()
+  WHERE id = p_investor_id;
+
+  -- Same deterministic ID as the Python paths: one row per investor per week,
+  -- enforced by the UNIQUE constraint on transactions.transaction_id
+  v_transaction_id := 'INT-' || p_investor_id || '-W' || (v_counter + 1);
+
+  INSERT INTO transactions (
+    investor_id, amount, transaction_type, transaction_id, email,
+    account_number, portfolio_type, investment_type, withdraw_status
+  ) VALUES (
+    p_investor_id, v_interest, 'interest_deposit', v_transaction_id, v_investor.email,
+    v_investor.account_number, v_investor.portfolio_type, v_investor.investment_type, 'completed'
+  );
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'paid', true,
+    'interest_deposited', v_interest,
+    'new_balance', v_balance,
+    'transaction_id', v_transaction_id,
+    'next_due_date', v_next_due
+  );
+END;
+$$;
@@ -0,0 +1,50 @@
+-- Update a withdrawal transaction's status in a single round trip.
+-- Called by TransactionService.update_withdrawal_status via
+-- supabase.rpc('process_withdrawal_status_update', ...).
+--
+-- Locks the transaction row, records the failure reason for failed
+-- withdrawals and the payout amount for sent ones, applies paystack_ref /
+-- paystack_status from p_extra when given, and returns the updated row. investors.total_paid is deliberately not touched: it is incremented
+-- when interest is paid into the spending account, so adding withdrawals
+-- here would double-count.
+
+DROP FUNCTION IF EXISTS public.process_withdrawal_status_update(text, text, text);
+
+CREATE OR REPLACE FUNCTION public.process_withdrawal_status_update(
+  p_transaction_id text,
+  p_status text,
+  p_reason text DEFAULT NULL,
+  p_extra jsonb DEFAULT NULL
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_tx transactions%ROWTYPE;
+  v_sent_withdrawal boolean;
+BEGIN
+  SELECT * INTO v_tx FROM transactions WHERE transaction_id = p_transaction_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN jsonb_build_object('success', false, 'error', 'Transaction not found');
+  END IF;
+
+  v_sent_withdrawal := p_status = 'sent' AND v_tx.transaction_type = 'withdrawal';
+
+  IF v_sent_withdrawal AND NOT EXISTS (SELECT 1 FROM investors WHERE id = v_tx.investor_id) THEN
+    RETURN jsonb_build_object('success', false, 'error', 'Investor not found');
+  END IF;
+
+  UPDATE transactions
+  SET withdraw_status = p_status,
+      failure_reason = CASE WHEN p_status = 'failed' AND p_reason IS NOT NULL THEN p_reason ELSE failure_reason END,
+      withdrawal_amount = CASE WHEN v_sent_withdrawal THEN v_tx.amount ELSE withdrawal_amount END,
+      paystack_ref = COALESCE(p_extra->>'paystack_ref', paystack_ref),
+      paystack_status = COALESCE(p_extra->>'paystack_status', paystack_status),
+      updated_at = now()
+  WHERE id = v_tx.id
+  RETURNING * INTO v_tx;
+
+  RETURN jsonb_build_object('success', true, 'data', to_jsonb(v_tx));
+END;
+$$;
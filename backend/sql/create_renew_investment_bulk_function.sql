@@ -0,0 +1,70 @@
+-- Renew several investors' investments in a single round trip.
+-- Called by TransactionService.renew_investments_bulk via
+-- supabase.rpc('renew_investment_bulk', ...).
+--
+-- Set-based counterpart of renew_investment_tx: locks the investor rows,
+-- takes a 20% service fee from each initial investment, resets every
+-- investment cycle and records one renew_investment transaction per investor
+-- in one statement. Unknown IDs are skipped. Returns the inserted transaction
+-- rows.
+
+CREATE OR REPLACE FUNCTION public.renew_investment_bulk(
+  p_investor_ids uuid[]
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_rows jsonb;
+BEGIN
+  WITH old AS (
+    SELECT id, email, account_number, portfolio_type, investment_type,
+           COALESCE(initial_investment, 0) AS initial
+    FROM investors
+    WHERE id = ANY(p_investor_ids)
+    FOR UPDATE
+  ), upd AS (
+    -- Keep the deposit (less the fee) and start a fresh cycle
+    UPDATE investors i
+    SET initial_investment = old.initial - old.initial * 0.20,
+        total_investment = old.initial - old.initial * 0.20,
+        investment_type = NULL,
+        investment_started = false,
+        investment_ended = false,
+        payment_counter = 0,
+        current_week = 0,
+        total_paid = 0,
+        investment_start_date = NULL,
+        last_due_date = NULL,
+        next_due_date = NULL,
+        investment_expiry_date = NULL,
+        created_at = now(),
+        updated_at = now()
+    FROM old
+    WHERE i.id = old.id
+    RETURNING old.*
+  ), ins AS (
+    INSERT INTO transactions (
+      email, account_number, initial_balance, portfolio_type, investment_type,
+      amount_due, last_due_date, next_due_date, withdrawal_requested, withdraw_status,
+      failure_reason, transaction_id, paystack_ref, paystack_status, transaction_type,
+      amount, service_fee, withdrawal_timestamp, paystack_timestamp, investor_id
+    )
+    SELECT
+      email, account_number, initial, portfolio_type, investment_type,
+      0, current_date, NULL, false, 'none',
+      NULL, 'RENEW-' || upper(substr(replace(gen_random_uuid()::text, '-', ''), 1, 12)), NULL, 'completed', 'renew_investment',
+      initial - initial * 0.20, initial * 0.20, now(), now(), id
+    FROM upd
+    RETURNING *
+  )
+  SELECT COALESCE(jsonb_agg(to_jsonb(ins)), '[]'::jsonb) INTO v_rows FROM ins;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'data', v_rows,
+    'count', jsonb_array_length(v_rows)
+  );
+END;
+$$;
@@ -0,0 +1,75 @@
+-- Renew an investor's investment in a single round trip.
+-- Called by TransactionService.renew_investment via
+-- supabase.rpc('renew_investment_tx', ...).
+--
+-- Locks the investor row, takes a 20% service fee from the initial
+-- investment, resets the investment cycle and records the renew_investment
+-- transaction in one database transaction. The RENEW-<hex> transaction ID is
+-- generated here. Returns the inserted transaction row together with the
+-- service fee and remaining amount.
+
+DROP FUNCTION IF EXISTS public.renew_investment_tx(uuid, text);
+
+CREATE OR REPLACE FUNCTION public.renew_investment_tx(
+  p_investor_id uuid
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_investor investors%ROWTYPE;
+  v_initial numeric;
+  v_service_fee numeric;
+  v_remaining numeric;
+  v_tx transactions%ROWTYPE;
+BEGIN
+  SELECT * INTO v_investor FROM investors WHERE id = p_investor_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RETURN jsonb_build_object('success', false, 'error', 'Investor not found');
+  END IF;
+
+  v_initial := COALESCE(v_investor.initial_investment, 0);
+  v_service_fee := v_initial * 0.20;
+  v_remaining := v_initial - v_service_fee;
+
+  -- Keep the deposit (less the fee) and start a fresh cycle
+  UPDATE investors
+  SET initial_investment = v_remaining,
+      total_investment = v_remaining,
+      investment_type = NULL,
+      investment_started = false,
+      investment_ended = false,
+      payment_counter = 0,
+      current_week = 0,
+      total_paid = 0,
+      investment_start_date = NULL,
+      last_due_date = NULL,
+      next_due_date = NULL,
+      investment_expiry_date = NULL,
+      created_at = now(),
+      updated_at = now()
+  WHERE id = p_investor_id;
+
+  INSERT INTO transactions (
+    email, account_number, initial_balance, portfolio_type, investment_type,
+    amount_due, last_due_date, next_due_date, withdrawal_requested, withdraw_status,
+    failure_reason, transaction_id, paystack_ref, paystack_status, transaction_type,
+    amount, service_fee, withdrawal_timestamp, paystack_timestamp, investor_id
+  )
+  VALUES (
+    v_investor.email, v_investor.account_number, v_initial, v_investor.portfolio_type, v_investor.investment_type,
+    0, current_date, NULL, false, 'none',
+    NULL, 'RENEW-' || upper(substr(replace(gen_random_uuid()::text, '-', ''), 1, 12)), NULL, 'completed', 'renew_investment',
+    v_remaining, v_service_fee, now(), now(), p_investor_id
+  )
+  RETURNING * INTO v_tx;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'data', to_jsonb(v_tx),
+    'service_fee', v_service_fee,
+    'remaining_amount', v_remaining
+  );
+END;
+$$;
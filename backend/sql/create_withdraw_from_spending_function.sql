@@ -0,0 +1,41 @@
+-- Deduct a withdrawal from an investor's spending account in a single round trip.
+-- Called by InterestCalculationService.process_user_withdrawal via
+-- supabase.rpc('withdraw_from_spending', ...).
+--
+-- The balance check and the deduction happen in one conditional UPDATE,
+-- so two concurrent withdrawals can never overdraw the account.
+
+CREATE OR REPLACE FUNCTION public.withdraw_from_spending(
+  p_investor_id uuid,
+  p_amount numeric
+)
+RETURNS jsonb
+LANGUAGE plpgsql
+SET search_path = public, pg_temp
+AS $$
+DECLARE
+  v_balance numeric;
+  v_total_withdrawn numeric;
+BEGIN
+  UPDATE spending_accounts
+  SET balance = COALESCE(balance, 0) - p_amount,
+      total_withdrawn = COALESCE(total_withdrawn, 0) + p_amount
+  WHERE investor_id = p_investor_id
+    AND COALESCE(balance, 0) >= p_amount
+  RETURNING balance, total_withdrawn INTO v_balance, v_total_withdrawn;
+
+  IF NOT FOUND THEN
+    IF EXISTS (SELECT 1 FROM spending_accounts WHERE investor_id = p_investor_id) THEN
+      RETURN jsonb_build_object('success', false, 'error', 'Insufficient balance in spending account');
+    END IF;
+    RETURN jsonb_build_object('success', false, 'error', 'Spending account not found');
+  END IF;
+
+  RETURN jsonb_build_object(
+    'success', true,
+    'withdrawn_amount', p_amount,
+    'new_balance', v_balance,
+    'total_withdrawn', v_total_withdrawn
+  );
+END;
+$$;
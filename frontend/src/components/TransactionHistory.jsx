@@ -126,17 +126,19 @@ const TransactionHistory = ({ limit, onReportIssue, transactions: propTransactio
 
       // Check for pywebview and use specific API
       if (window.pywebview && window.pywebview.api) {
-        // Convert buffer to base64
-        const base64String = btoa(
-          new Uint8Array(buffer)
-            .reduce((data, byte) => data + String.fromCharCode(byte), '')
-        );
-
-        const result = await window.pywebview.api.save_file(filename, base64String);
+        // Pick the destination natively, then send the raw bytes to the local server
+        const result = await window.pywebview.api.choose_save_path(filename);
         if (!result.success) {
           if (result.reason !== 'cancelled') {
             throw new Error(result.error || 'Native save failed');
           }
+        } else {
+          const saveResponse = await fetch(result.upload_url, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/octet-stream' },
+            body: buffer
+          });
+          if (!saveResponse.ok) throw new Error('Native save failed');
         }
       } else {
         // Standard Browser Download as fallback